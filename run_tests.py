@@ -1,14 +1,36 @@
 #!/usr/bin/env python3
 """Test runner for Snooze components."""
 
+import glob
+import io
 import os
 import sys
 import unittest
+from concurrent.futures import ProcessPoolExecutor
 
 import dotenv
 
-# Load environment variables
-dotenv.load_dotenv()
+# Load environment variables from the project's .env directly, skipping the
+# upward directory search done by find_dotenv()
+dotenv.load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+
+def run_test_module(start_dir, module_name):
+    """Run a single test module and return its output and picklable results."""
+    if start_dir not in sys.path:
+        sys.path.insert(0, start_dir)
+
+    suite = unittest.TestLoader().loadTestsFromName(module_name)
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+
+    return {
+        "output": stream.getvalue(),
+        "tests_run": result.testsRun,
+        "failures": [(str(test), tb) for test, tb in result.failures],
+        "errors": [(str(test), tb) for test, tb in result.errors],
+        "skipped": [(str(test), reason) for test, reason in result.skipped],
+    }
 
 
 def main():
@@ -31,42 +53,55 @@ def main():
     print(f"📋 Test Environment:")
     print(f"   Reddit API: {'✅ Available' if reddit_creds else '❌ Missing'}")
     print(f"   Azure OpenAI: {'✅ Available' if azure_creds else '❌ Missing'}")
+    print(f"   Live API tests: {'✅ Enabled' if os.getenv('SNOOZE_LIVE_TESTS') else '⏭️  Disabled (set SNOOZE_LIVE_TESTS=1)'}")
     print()
 
-    # Discover and run tests
-    loader = unittest.TestLoader()
-    start_dir = 'tests'
-    suite = loader.discover(start_dir, pattern='test_*.py')
-
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    # Discover test modules and run them in parallel, one process per module
+    start_dir = os.path.abspath('tests')
+    module_names = sorted(
+        os.path.splitext(os.path.basename(path))[0]
+        for path in glob.glob(os.path.join(start_dir, 'test_*.py'))
+    )
+
+    tests_run = 0
+    failures, errors, skipped = [], [], []
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(
+            run_test_module, [start_dir] * len(module_names), module_names
+        )
+        for module_result in results:
+            sys.stderr.write(module_result["output"])
+            tests_run += module_result["tests_run"]
+            failures.extend(module_result["failures"])
+            errors.extend(module_result["errors"])
+            skipped.extend(module_result["skipped"])
 
     print()
     print("=" * 50)
     print("📊 Test Summary:")
-    print(f"   Tests run: {result.testsRun}")
-    print(f"   Failures: {len(result.failures)}")
-    print(f"   Errors: {len(result.errors)}")
-    print(f"   Skipped: {len(result.skipped)}")
+    print(f"   Tests run: {tests_run}")
+    print(f"   Failures: {len(failures)}")
+    print(f"   Errors: {len(errors)}")
+    print(f"   Skipped: {len(skipped)}")
 
-    if result.failures:
+    if failures:
         print("\n❌ Failures:")
-        for test, traceback in result.failures:
+        for test, traceback in failures:
             print(f"   • {test}: {traceback.split('AssertionError:')[-1].strip()}")
 
-    if result.errors:
+    if errors:
         print("\n💥 Errors:")
-        for test, traceback in result.errors:
+        for test, traceback in errors:
             error_line = traceback.split('\n')[-2] if '\n' in traceback else traceback
             print(f"   • {test}: {error_line}")
 
-    if result.skipped:
+    if skipped:
         print("\n⏭️  Skipped:")
-        for test, reason in result.skipped:
+        for test, reason in skipped:
             print(f"   • {test}: {reason}")
 
     # Return appropriate exit code
-    if result.failures or result.errors:
+    if failures or errors:
         print("\n💡 Tip: Make sure your .env file has valid API credentials for integration tests")
         sys.exit(1)
     else:
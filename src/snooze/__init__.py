@@ -1,9 +1,6 @@
 """Snooze - Reddit AI Agent Discussion Analyzer."""
 
-from .crawler import RedditCrawler, RedditPost
-from .storage import DataStorage
-from .summarizer import DiscussionSummary, LLMSummarizer, PostSummary
-from .visualizer import SnoozeVisualizer, create_app
+import importlib
 
 __version__ = "0.1.0"
 __all__ = [
@@ -17,6 +14,25 @@ __all__ = [
     "DataStorage",
 ]
 
+# Public names are imported on first access so the CLI does not pay for
+# asyncpraw, openai and Flask on commands that never use them
+_EXPORTS = {
+    "RedditCrawler": ".crawler",
+    "RedditPost": ".crawler",
+    "DataStorage": ".storage",
+    "DiscussionSummary": ".summarizer",
+    "LLMSummarizer": ".summarizer",
+    "PostSummary": ".summarizer",
+    "SnoozeVisualizer": ".visualizer",
+    "create_app": ".visualizer",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def hello() -> str:
     return "Hello from snooze!"
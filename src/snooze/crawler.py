@@ -1,12 +1,66 @@
+import asyncio
+import heapq
 import os
+import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from itertools import islice
+from typing import List, Optional, Set
 
 import asyncpraw
 
+DEFAULT_SUBREDDITS = (
+    "vibecoding",
+    "ClaudeCode",
+    "codex",
+    "GithubCopilot",
+    "ChatGPTCoding",
+    "cursor",
+)
 
-@dataclass
+DEFAULT_KEYWORDS = (
+    "copilot",
+    "claude",
+    "chatgpt",
+    "cursor",
+    "coding",
+    "code",
+    "programming",
+    "debug",
+    "script",
+    "ai assistant",
+    "coding assistant",
+    "github copilot",
+    "claude code",
+    "chatgpt coding",
+    "cursor ai",
+    "autocomplete",
+    "intellisense",
+    "pair programming",
+    "code generation",
+)
+
+# Subreddits dedicated to AI coding tools, whose posts skip the keyword filter
+_CODING_SUBREDDITS = frozenset(
+    {"claudecode", "codex", "githubcopilot", "chatgptcoding", "cursor"}
+)
+
+# Worker tasks and queue size used to pipeline submissions per subreddit
+_SUBMISSION_WORKERS = 8
+_SUBMISSION_QUEUE_SIZE = 32
+
+
+def _compile_keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into a single case-insensitive regex alternation."""
+    return re.compile(
+        "|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE
+    )
+
+
+_DEFAULT_KEYWORD_PATTERN = _compile_keyword_pattern(DEFAULT_KEYWORDS)
+
+
+@dataclass(slots=True)
 class RedditPost:
     """Represents a Reddit post with relevant metadata."""
 
@@ -26,6 +80,8 @@ class RedditPost:
 class RedditCrawler:
     """Crawls Reddit for AI agent-related discussions."""
 
+    __slots__ = ("async_reddit",)
+
     def __init__(
         self,
         client_id: str,
@@ -47,32 +103,53 @@ class RedditCrawler:
             client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
         )
 
+    def _run_sync(self, coro):
+        """Run a crawler coroutine to completion from synchronous code.
+
+        asyncpraw opens its aiohttp session lazily on the running loop, so the
+        session is closed before asyncio.run closes that loop. The next call
+        then opens a fresh session instead of reusing one tied to a dead loop.
+        """
+
+        async def run_and_close():
+            try:
+                return await coro
+            finally:
+                await self.async_reddit.close()
+
+        return asyncio.run(run_and_close())
+
     async def _extract_comments_async(
         self, submission, max_comments: int = 50
     ) -> List[str]:
-        """Extract top-level comments from an async submission."""
+        """Extract top-level comments from an async submission.
+
+        "Load more comments" stubs are dropped rather than expanded
+        (``replace_more(limit=0)``), so only the top-level comments returned
+        with the initial comment listing are considered. Expanding them costs
+        an extra request per stub, and at most ``max_comments`` are kept.
+        """
         comments = []
         try:
-            # Check if submission has comments attribute and it's not None
-            if not hasattr(submission, "comments") or submission.comments is None:
+            # A missing comments attribute raises AttributeError, handled below
+            forest = submission.comments
+            if forest is None:
                 return comments
 
-            await submission.comments.replace_more(limit=None)
-
-            # Process comments with proper iteration and counting
-            comment_count = 0
-            async for comment in submission.comments:
-                if comment_count >= max_comments:
-                    break
+            await forest.replace_more(limit=0)
 
-                if (
-                    hasattr(comment, "body")
-                    and comment.body
-                    and comment.body != "[deleted]"
-                    and comment.body is not None
-                ):
-                    comments.append(comment.body)
-                    comment_count += 1
+            # Walk the already-loaded top-level comments synchronously and stop
+            # as soon as enough usable bodies have been collected
+            comments = list(
+                islice(
+                    (
+                        comment.body
+                        for comment in forest[:]
+                        if comment.body and comment.body != "[deleted]"
+                    ),
+                    max_comments,
+                )
+            )
 
         except (AttributeError, TypeError):
             # print(f"Error extracting comments (submission issue): {e}")
@@ -104,88 +181,170 @@ class RedditCrawler:
             comments=comments,
         )
 
+    async def _fetch_subreddit_async(
+        self,
+        subreddit_name: str,
+        limit_per_subreddit: int,
+        include_comments: bool,
+        keyword_pattern: re.Pattern,
+        semaphore: asyncio.Semaphore,
+        seen_ids: Set[str],
+    ) -> List[RedditPost]:
+        """Get coding-related posts from a single subreddit asynchronously.
+
+        Submissions are streamed from the listing through a bounded queue to
+        worker tasks, so comment fetching overlaps with listing pagination.
+        """
+        subreddit = await self.async_reddit.subreddit(subreddit_name)
+        is_coding_subreddit = subreddit_name.lower() in _CODING_SUBREDDITS
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBMISSION_QUEUE_SIZE)
+        posts = {}
+
+        async def produce():
+            count = 0
+            async for submission in subreddit.hot(
+                limit=limit_per_subreddit * 2
+            ):  # Get more to filter
+                if count >= limit_per_subreddit:
+                    break
+
+                # Always include posts from these specific coding subreddits
+                # but also check for coding keywords to be more selective.
+                # The title is searched first and the body only on a miss.
+                # For coding subreddits, be more inclusive but still filter out completely unrelated posts
+                is_coding_related = (
+                    is_coding_subreddit
+                    or keyword_pattern.search(submission.title) is not None
+                    or (
+                        bool(submission.selftext)
+                        and keyword_pattern.search(submission.selftext) is not None
+                    )
+                )
+
+                # Skip submissions already queued by any listing in this crawl
+                if is_coding_related and submission.id not in seen_ids:
+                    seen_ids.add(submission.id)
+                    await queue.put((count, submission))
+                    count += 1
+
+            # One sentinel per worker signals the end of the listing
+            for _ in range(_SUBMISSION_WORKERS):
+                await queue.put(None)
+
+        async def consume():
+            while (item := await queue.get()) is not None:
+                index, submission = item
+                # One bad submission is skipped rather than cancelling the
+                # workers and losing the posts already converted
+                try:
+                    async with semaphore:
+                        posts[index] = await self._submission_to_post_async(
+                            submission, include_comments
+                        )
+                except Exception as e:
+                    print(
+                        f"Error converting submission {submission.id} "
+                        f"in r/{subreddit_name}: {e}"
+                    )
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce())
+            for _ in range(_SUBMISSION_WORKERS):
+                group.create_task(consume())
+
+        # Keep the listing order regardless of which worker finished first
+        return [posts[index] for index in sorted(posts)]
+
     async def get_coding_discussions_async(
         self,
         subreddit_names: Optional[List[str]] = None,
         limit_per_subreddit: int = 25,
         include_comments: bool = True,
         coding_keywords: Optional[List[str]] = None,
+        max_concurrent: int = 16,
     ) -> List[RedditPost]:
-        """Get coding-related posts from specified subreddits asynchronously."""
+        """Get coding-related posts from specified subreddits asynchronously.
+
+        Subreddits are fetched concurrently so their network latency overlaps,
+        and at most ``max_concurrent`` submissions are converted at once.
+        """
 
         if subreddit_names is None:
-            subreddit_names = [
-                "vibecoding",
-                "ClaudeCode",
-                "codex",
-                "GithubCopilot",
-                "ChatGPTCoding",
-                "cursor",
-            ]
+            subreddit_names = DEFAULT_SUBREDDITS
 
         if coding_keywords is None:
-            coding_keywords = [
-                "copilot",
-                "claude",
-                "chatgpt",
-                "cursor",
-                "coding",
-                "code",
-                "programming",
-                "debug",
-                "script",
-                "ai assistant",
-                "coding assistant",
-                "github copilot",
-                "claude code",
-                "chatgpt coding",
-                "cursor ai",
-                "autocomplete",
-                "intellisense",
-                "pair programming",
-                "code generation",
-            ]
+            keyword_pattern = _DEFAULT_KEYWORD_PATTERN
+        else:
+            keyword_pattern = _compile_keyword_pattern(coding_keywords)
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+        seen_ids = set()
+        results = await asyncio.gather(
+            *[
+                self._fetch_subreddit_async(
+                    subreddit_name,
+                    limit_per_subreddit,
+                    include_comments,
+                    keyword_pattern,
+                    semaphore,
+                    seen_ids,
+                )
+                for subreddit_name in subreddit_names
+            ],
+            return_exceptions=True,
+        )
 
         all_posts = []
+        for subreddit_name, result in zip(subreddit_names, results):
+            if isinstance(result, BaseException):
+                print(f"Error accessing r/{subreddit_name}: {result}")
+                continue
+            all_posts.extend(result)
 
-        for subreddit_name in subreddit_names:
-            try:
-                subreddit = await self.async_reddit.subreddit(subreddit_name)
-                post_count = 0
-
-                async for submission in subreddit.hot(
-                    limit=limit_per_subreddit * 2
-                ):  # Get more to filter
-                    if post_count >= limit_per_subreddit:
-                        break
-
-                    # Always include posts from these specific coding subreddits
-                    # but also check for coding keywords to be more selective
-                    text_to_check = f"{submission.title} {submission.selftext}".lower()
-
-                    # For coding subreddits, be more inclusive but still filter out completely unrelated posts
-                    is_coding_related = subreddit_name.lower() in [
-                        "claudecode",
-                        "codex",
-                        "githubcopilot",
-                        "chatgptcoding",
-                        "cursor",
-                    ] or any(
-                        keyword.lower() in text_to_check for keyword in coding_keywords
-                    )
+        return all_posts
 
-                    if is_coding_related:
-                        post = await self._submission_to_post_async(
-                            submission, include_comments
-                        )
-                        all_posts.append(post)
-                        post_count += 1
+    def get_coding_discussions(
+        self,
+        subreddit_names: Optional[List[str]] = None,
+        limit_per_subreddit: int = 25,
+        include_comments: bool = True,
+        coding_keywords: Optional[List[str]] = None,
+    ) -> List[RedditPost]:
+        """Get coding-related posts from specified subreddits synchronously."""
+        return self._run_sync(
+            self.get_coding_discussions_async(
+                subreddit_names, limit_per_subreddit, include_comments, coding_keywords
+            )
+        )
 
-            except Exception as e:
-                print(f"Error accessing r/{subreddit_name}: {e}")
-                continue
+    async def search_subreddit_async(
+        self,
+        subreddit_name: str,
+        query: str,
+        limit: int = 25,
+        include_comments: bool = True,
+        max_concurrent: int = 16,
+    ) -> List[RedditPost]:
+        """Search a subreddit for posts matching a query asynchronously.
 
-        return all_posts
+        At most ``max_concurrent`` submissions are converted at once, as in
+        ``get_coding_discussions_async``.
+        """
+        subreddit = await self.async_reddit.subreddit(subreddit_name)
+        submissions = [
+            submission async for submission in subreddit.search(query, limit=limit)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def convert(submission):
+            async with semaphore:
+                return await self._submission_to_post_async(
+                    submission, include_comments
+                )
+
+        return list(
+            await asyncio.gather(*[convert(submission) for submission in submissions])
+        )
 
     async def get_all_coding_discussions_async(
         self,
@@ -193,14 +352,7 @@ class RedditCrawler:
         include_comments: bool = True,
     ) -> List[RedditPost]:
         """Get coding discussions from all target subreddits asynchronously."""
-        target_subreddits = [
-            "vibecoding",
-            "ClaudeCode",
-            "codex",
-            "GithubCopilot",
-            "ChatGPTCoding",
-            "cursor",
-        ]
+        target_subreddits = DEFAULT_SUBREDDITS
 
         posts = await self.get_coding_discussions_async(
             target_subreddits,
@@ -208,7 +360,16 @@ class RedditCrawler:
             include_comments=include_comments,
         )
 
-        # Sort by score and recency, prioritizing recent high-engagement posts
-        posts.sort(key=lambda p: (p.score, p.created_utc), reverse=True)
+        # Select the top posts by score and recency, prioritizing recent
+        # high-engagement posts, without sorting the whole list
+        return heapq.nlargest(limit, posts, key=lambda p: (p.score, p.created_utc))
 
-        return posts[:limit]
+    def get_all_coding_discussions(
+        self,
+        limit: int = 50,
+        include_comments: bool = True,
+    ) -> List[RedditPost]:
+        """Get coding discussions from all target subreddits synchronously."""
+        return self._run_sync(
+            self.get_all_coding_discussions_async(limit, include_comments)
+        )
@@ -2,20 +2,13 @@
 """Main entry point for the Snooze application."""
 
 import argparse
+import asyncio
 import os
 import sys
 
-import dotenv
-
-from .crawler import RedditCrawler
-from .summarizer import LLMSummarizer
-from .visualizer import SnoozeVisualizer
-
 
 def main():
     """Main entry point for the Snooze CLI."""
-    dotenv.load_dotenv()
-
     parser = argparse.ArgumentParser(
         description="Snooze - Reddit AI Agent Discussion Analyzer"
     )
@@ -66,20 +59,28 @@ def main():
         parser.print_help()
         return
 
-    # Check environment variables
-    required_env_vars = ["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"]
-    if args.command in ["analyze", "web"]:
-        required_env_vars.extend(
-            ["AZURE_API_KEY", "AZURE_ENDPOINT", "AZURE_DEPLOYMENT"]
-        )
+    # Load and check environment variables for commands that talk to APIs
+    if args.command in ["analyze", "web", "crawl"]:
+        import dotenv
 
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
-    if missing_vars:
-        print(
-            f"Error: Missing required environment variables: {', '.join(missing_vars)}"
-        )
-        print("Please set these in your .env file or environment.")
-        sys.exit(1)
+        dotenv.load_dotenv()
+
+        required_env_vars = ["REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET"]
+        if args.command in ["analyze", "web"]:
+            required_env_vars.extend(
+                ["AZURE_API_KEY", "AZURE_ENDPOINT", "AZURE_DEPLOYMENT"]
+            )
+
+        missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+        if missing_vars:
+            print(
+                f"Error: Missing required environment variables: {', '.join(missing_vars)}"
+            )
+            print("Please set these in your .env file or environment.")
+            sys.exit(1)
+
+    if args.command in ["analyze", "web"]:
+        configure_logging()
 
     try:
         if args.command == "web":
@@ -97,8 +98,35 @@ def main():
         sys.exit(1)
 
 
+def configure_logging():
+    """Print progress logs from a background thread.
+
+    Records are put on a queue by the logging call and written to stdout by a
+    listener thread, so the event loop never blocks on console output.
+    """
+    import atexit
+    import logging
+    import logging.handlers
+    import queue
+
+    log_queue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console)
+
+    logger = logging.getLogger("snooze")
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener.start()
+    atexit.register(listener.stop)
+
+
 def run_web_interface(args):
     """Run the web interface."""
+    from .visualizer import SnoozeVisualizer
+
     print(f"Starting Snooze web interface at http://{args.host}:{args.port}")
     visualizer = SnoozeVisualizer()
     visualizer.run(host=args.host, port=args.port, debug=args.debug)
@@ -106,71 +134,119 @@ def run_web_interface(args):
 
 def run_analysis(args):
     """Run analysis of Reddit discussions."""
+    from .crawler import RedditCrawler
+    from .storage import DataStorage
+    from .summarizer import LLMSummarizer
+
     print("Initializing Reddit crawler and LLM summarizer...")
 
     crawler = RedditCrawler.from_env()
     summarizer = LLMSummarizer.from_env()
+    storage = DataStorage()
 
-    print(f"Crawling posts from subreddits: {', '.join(args.subreddits)}")
-    posts = crawler.get_all_coding_discussions(limit=args.limit)
-    print(f"Found {len(posts)} relevant posts")
+    async def analyze():
+        print(f"Crawling posts from subreddits: {', '.join(args.subreddits)}")
+        posts = await crawler.get_all_coding_discussions_async(limit=args.limit)
+        print(f"Found {len(posts)} relevant posts")
 
-    if not posts:
-        print("No posts found. Try different subreddits or increase the limit.")
-        return
+        if not posts:
+            print("No posts found. Try different subreddits or increase the limit.")
+            return None
+
+        # Only posts without a fresh cached summary go to the LLM
+        cached_summaries, posts_needing_analysis = storage.partition_by_cache(posts)
+        print(
+            f"Analyzing {len(posts_needing_analysis)} posts with LLM "
+            f"({len(cached_summaries)} cached)..."
+        )
+        # Each finished batch is cached at once, so an interrupted run keeps
+        # the summaries it already paid for
+        new_summaries = await summarizer.summarize_posts_async(
+            posts_needing_analysis,
+            batch_callback=lambda batch: asyncio.to_thread(
+                storage.save_post_summaries, batch
+            ),
+        )
 
-    print("Analyzing posts with LLM...")
-    summaries = summarizer.summarize_posts(posts)
-    print(f"Successfully analyzed {len(summaries)} posts")
+        summaries = [s for s in cached_summaries + new_summaries if s.is_relevant]
+        print(f"Successfully analyzed {len(summaries)} relevant posts")
+
+        if not summaries:
+            return None
 
-    if summaries:
         print("Creating discussion summary...")
-        discussion = summarizer.create_discussion_summary(summaries)
-
-        if discussion:
-            print("\n" + "=" * 80)
-            print("ANALYSIS RESULTS")
-            print("=" * 80)
-            print(f"Topic: {discussion.topic}")
-            print(f"Total Engagement: {discussion.total_engagement}")
-            print("\nSentiment Overview:")
-            print(f"  {discussion.sentiment_overview}")
-            print("\nKey Insights:")
-            for i, insight in enumerate(discussion.key_insights, 1):
-                print(f"  {i}. {insight}")
-            print("\nCommon Themes:")
-            for theme in discussion.common_themes:
-                print(f"  • {theme}")
-
-            if args.output:
-                save_results_to_file(discussion, args.output)
-                print(f"\nResults saved to {args.output}")
+        return await summarizer._create_discussion_summary_async(summaries)
+
+    discussion = asyncio.run(analyze())
+
+    if discussion:
+        print("\n" + "=" * 80)
+        print("ANALYSIS RESULTS")
+        print("=" * 80)
+        print(f"Topic: {discussion.topic}")
+        print(f"Total Engagement: {discussion.total_engagement}")
+        print("\nSentiment Overview:")
+        print(f"  {discussion.sentiment_overview}")
+        print("\nKey Insights:")
+        for i, insight in enumerate(discussion.key_insights, 1):
+            print(f"  {i}. {insight}")
+        print("\nCommon Themes:")
+        for theme in discussion.common_themes:
+            print(f"  • {theme}")
+
+        if args.output:
+            save_results_to_file(discussion, args.output)
+            print(f"\nResults saved to {args.output}")
 
     print("\nAnalysis complete!")
 
 
 def run_crawl(args):
     """Run crawling of Reddit posts."""
+    from .crawler import RedditCrawler
+
     print("Initializing Reddit crawler...")
     crawler = RedditCrawler.from_env()
-
-    posts = []
-    for subreddit in args.subreddits:
-        print(f"Crawling r/{subreddit}...")
-        if args.search:
-            subreddit_posts = list(
-                crawler.search_subreddit(
-                    subreddit, args.search, limit=args.limit // len(args.subreddits)
-                )
+    limit_per_subreddit = args.limit // len(args.subreddits)
+
+    print(f"Crawling {', '.join(f'r/{s}' for s in args.subreddits)}...")
+    if args.search:
+
+        async def search_all():
+            # Search every subreddit concurrently so their latency overlaps
+            return await asyncio.gather(
+                *[
+                    crawler.search_subreddit_async(
+                        subreddit, args.search, limit=limit_per_subreddit
+                    )
+                    for subreddit in args.subreddits
+                ],
+                return_exceptions=True,
             )
-        else:
-            subreddit_posts = list(
-                crawler.get_coding_discussions(
-                    [subreddit], limit_per_subreddit=args.limit // len(args.subreddits)
-                )
+
+        results = asyncio.run(search_all())
+    else:
+        # One call crawls every subreddit concurrently under a shared
+        # concurrency cap and drops posts seen in more than one listing
+        posts = asyncio.run(
+            crawler.get_coding_discussions_async(
+                args.subreddits, limit_per_subreddit=limit_per_subreddit
             )
+        )
+        by_subreddit = {}
+        for post in posts:
+            by_subreddit.setdefault(post.subreddit.lower(), []).append(post)
+        results = [
+            by_subreddit.get(subreddit.lower(), []) for subreddit in args.subreddits
+        ]
+
+    posts = []
+    for subreddit, subreddit_posts in zip(args.subreddits, results):
+        if isinstance(subreddit_posts, BaseException):
+            print(f"  r/{subreddit}: error: {subreddit_posts}")
+            continue
         posts.extend(subreddit_posts)
-        print(f"  Found {len(subreddit_posts)} posts")
+        print(f"  r/{subreddit}: found {len(subreddit_posts)} posts")
 
     print(f"\nCrawl complete! Total posts: {len(posts)}")
     for post in posts[:5]:  # Show first 5 posts
@@ -212,13 +288,10 @@ def run_check_ports():
     import socket
 
     def check_port(host, port):
-        """Check if a port is available."""
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind((host, port))
-                return True
-        except OSError:
-            return False
+        """Check if a port is available, i.e. nothing is listening on it."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.05)
+            return s.connect_ex((host, port)) != 0
 
     host = "127.0.0.1"
     common_ports = [5000, 8080, 8000, 3000, 8888, 9000, 8081, 8082]
@@ -228,9 +301,10 @@ def run_check_ports():
 
     available_ports = []
     for port in common_ports:
-        status = "✅ Available" if check_port(host, port) else "❌ In use"
+        is_available = check_port(host, port)
+        status = "✅ Available" if is_available else "❌ In use"
         print(f"Port {port:4d}: {status}")
-        if check_port(host, port):
+        if is_available:
             available_ports.append(port)
 
     print("\n💡 Usage:")
@@ -2,14 +2,53 @@
 """Local storage utilities for caching Reddit data and LLM summaries."""
 
 import hashlib
-import json
-from datetime import datetime, timedelta
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+import zstandard
 
 from .crawler import RedditPost
 from .summarizer import DiscussionSummary, PostSummary
 
+# Maximum number of parsed post summaries kept in memory per storage instance
+_SUMMARY_CACHE_SIZE = 4096
+
+# Suffixes of cache files, checked in order; posts are stored zstd-compressed
+_CACHE_SUFFIXES = (".json.zst", ".json")
+
+
+def _post_summary_from_dict(data: Dict[str, Any]) -> PostSummary:
+    """Rebuild a PostSummary from its stored dict, tolerating older formats."""
+    created_utc = None
+    if data.get("created_utc"):
+        created_utc = datetime.fromisoformat(data["created_utc"])
+
+    return PostSummary(
+        original_post_id=data["original_post_id"],
+        title=data["title"],
+        key_points=data["key_points"],
+        sentiment=data["sentiment"],
+        topics=data["topics"],
+        summary=data["summary"],
+        engagement_score=data["engagement_score"],
+        url=data["url"],
+        subreddit=data["subreddit"],
+        score=data.get("score", 0),
+        num_comments=data.get("num_comments", 0),
+        is_relevant=data.get("is_relevant", True),
+        relevance_reason=data.get("relevance_reason", ""),
+        created_utc=created_utc,
+    )
+
 
 class DataStorage:
     """Handles local storage and caching of Reddit posts and LLM summaries."""
@@ -23,69 +62,146 @@ class DataStorage:
         self.posts_dir = self.data_dir / "posts"
         self.summaries_dir = self.data_dir / "summaries"
         self.discussions_dir = self.data_dir / "discussions"
-        self.post_summaries_dir = (
-            self.data_dir / "post_summaries"
-        )  # Individual post summaries
 
         for directory in [
             self.posts_dir,
             self.summaries_dir,
             self.discussions_dir,
-            self.post_summaries_dir,
         ]:
             directory.mkdir(exist_ok=True)
 
+        # Individual post summaries live in a single SQLite index so batch
+        # lookups are one query instead of a stat and open per post
+        self.db_path = self.data_dir / "cache.sqlite"
+        self._db_lock = threading.Lock()
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS post_summaries "
+            "(id TEXT PRIMARY KEY, mtime REAL NOT NULL, payload BLOB NOT NULL)"
+        )
+        self.db.commit()
+
+        # Parsed post summaries keyed by post ID, tagged with the row mtime
+        # they were parsed from so rewritten rows are never served stale
+        self._summary_cache: OrderedDict[str, tuple] = OrderedDict()
+
+    def close(self) -> None:
+        """Close the post summary index."""
+        with self._db_lock:
+            self.db.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        """Run a read query against the post summary index."""
+        with self._db_lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _query_post_summaries(
+        self, columns: str, post_ids: List[str], cutoff: float
+    ) -> List[tuple]:
+        """Select rows for the given post IDs that were saved after cutoff."""
+        rows = []
+        # Stay well below SQLite's limit on bound parameters per statement
+        for start in range(0, len(post_ids), 500):
+            chunk = post_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                self._execute(
+                    f"SELECT {columns} FROM post_summaries "
+                    f"WHERE id IN ({placeholders}) AND mtime > ?",
+                    (*chunk, cutoff),
+                )
+            )
+        return rows
+
+    def _scan_cache_files(self, directory: Path) -> List[tuple]:
+        """List (key, path, stat result) triples for the cache files in a directory."""
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                for suffix in _CACHE_SUFFIXES:
+                    if entry.name.endswith(suffix):
+                        key = entry.name[: -len(suffix)]
+                        files.append((key, entry.path, entry.stat()))
+                        break
+        return files
+
+    def _write_json(
+        self, filepath: Path, data: Dict[str, Any], compress: bool = False
+    ) -> None:
+        """Write JSON to a temporary file and atomically move it into place.
+
+        Readers see either the previous file or the complete new one, never a
+        partially written file left behind by an interrupted save. Files are
+        written compactly; set SNOOZE_PRETTY_JSON to indent uncompressed files
+        for debugging. The temporary file is removed if the write fails.
+        """
+        if compress:
+            content = zstandard.ZstdCompressor(level=3).compress(orjson.dumps(data))
+        elif os.getenv("SNOOZE_PRETTY_JSON"):
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            content = orjson.dumps(data)
+
+        # A unique temporary name lets concurrent saves of one key each
+        # replace the file whole instead of racing on a shared temp file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=filepath.parent, prefix=f"{filepath.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read_json(self, filepath: Path) -> Any:
+        """Read a JSON cache file, decompressing it if needed."""
+        content = filepath.read_bytes()
+        if filepath.suffix == ".zst":
+            content = zstandard.ZstdDecompressor().decompress(content)
+        return orjson.loads(content)
+
     def _generate_cache_key(self, data: str) -> str:
         """Generate a cache key from data string."""
-        return hashlib.md5(data.encode()).hexdigest()
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
 
     def _is_cache_valid(self, filepath: Path, max_age_hours: int = 24) -> bool:
         """Check if cached file is still valid based on age."""
-        if not filepath.exists():
+        try:
+            mtime = filepath.stat().st_mtime
+        except FileNotFoundError:
             return False
 
-        file_time = datetime.fromtimestamp(filepath.stat().st_mtime)
-        return datetime.now() - file_time < timedelta(hours=max_age_hours)
+        return time.time() - mtime < max_age_hours * 3600
 
     def save_posts(self, posts: List[RedditPost], cache_key: str) -> None:
         """Save Reddit posts to local storage."""
-        filepath = self.posts_dir / f"{cache_key}.json"
+        filepath = self.posts_dir / f"{cache_key}.json.zst"
 
-        posts_data = {
-            "timestamp": datetime.now().isoformat(),
-            "posts": [
-                {
-                    "id": post.id,
-                    "title": post.title,
-                    "body": post.body,
-                    "author": post.author,
-                    "score": post.score,
-                    "num_comments": post.num_comments,
-                    "created_utc": post.created_utc.isoformat(),
-                    "url": post.url,
-                    "subreddit": post.subreddit,
-                    "permalink": post.permalink,
-                    "comments": post.comments,
-                }
-                for post in posts
-            ],
-        }
+        # orjson serializes dataclasses and datetimes natively
+        posts_data = {"timestamp": datetime.now(), "posts": posts}
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(posts_data, f, indent=2, ensure_ascii=False)
+        self._write_json(filepath, posts_data, compress=True)
+        # Drop any uncompressed copy left by an older version
+        (self.posts_dir / f"{cache_key}.json").unlink(missing_ok=True)
 
     def load_posts(
         self, cache_key: str, max_age_hours: int = 24
     ) -> Optional[List[RedditPost]]:
         """Load Reddit posts from local storage if cache is valid."""
-        filepath = self.posts_dir / f"{cache_key}.json"
-
-        if not self._is_cache_valid(filepath, max_age_hours):
+        # Fall back to uncompressed files written by older versions
+        for suffix in _CACHE_SUFFIXES:
+            filepath = self.posts_dir / f"{cache_key}{suffix}"
+            if self._is_cache_valid(filepath, max_age_hours):
+                break
+        else:
             return None
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = self._read_json(filepath)
 
             posts = []
             for post_data in data["posts"]:
@@ -106,7 +222,12 @@ class DataStorage:
 
             return posts
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (
+            orjson.JSONDecodeError,
+            zstandard.ZstdError,
+            KeyError,
+            ValueError,
+        ) as e:
             print(f"Error loading cached posts: {e}")
             return None
 
@@ -115,25 +236,17 @@ class DataStorage:
         filepath = self.summaries_dir / f"{cache_key}.json"
 
         summaries_data = {
-            "timestamp": datetime.now().isoformat(),
-            "summaries": [
-                {
-                    "original_post_id": summary.original_post_id,
-                    "title": summary.title,
-                    "key_points": summary.key_points,
-                    "sentiment": summary.sentiment,
-                    "topics": summary.topics,
-                    "summary": summary.summary,
-                    "engagement_score": summary.engagement_score,
-                    "url": summary.url,
-                    "subreddit": summary.subreddit,
-                }
-                for summary in summaries
-            ],
+            "timestamp": datetime.now(),
+            "summaries": summaries,
         }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(summaries_data, f, indent=2, ensure_ascii=False)
+        self._write_json(filepath, summaries_data)
+
+    def has_summaries(self, cache_key: str, max_age_hours: int = 24) -> bool:
+        """Check whether valid post summaries are cached under a key."""
+        return self._is_cache_valid(
+            self.summaries_dir / f"{cache_key}.json", max_age_hours
+        )
 
     def load_summaries(
         self, cache_key: str, max_age_hours: int = 24
@@ -145,27 +258,14 @@ class DataStorage:
             return None
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            summaries = []
-            for summary_data in data["summaries"]:
-                summary = PostSummary(
-                    original_post_id=summary_data["original_post_id"],
-                    title=summary_data["title"],
-                    key_points=summary_data["key_points"],
-                    sentiment=summary_data["sentiment"],
-                    topics=summary_data["topics"],
-                    summary=summary_data["summary"],
-                    engagement_score=summary_data["engagement_score"],
-                    url=summary_data["url"],
-                    subreddit=summary_data["subreddit"],
-                )
-                summaries.append(summary)
+            data = orjson.loads(filepath.read_bytes())
 
-            return summaries
+            return [
+                _post_summary_from_dict(summary_data)
+                for summary_data in data["summaries"]
+            ]
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading cached summaries: {e}")
             return None
 
@@ -173,33 +273,9 @@ class DataStorage:
         """Save discussion summary to local storage."""
         filepath = self.discussions_dir / f"{cache_key}.json"
 
-        discussion_data = {
-            "timestamp": datetime.now().isoformat(),
-            "discussion": {
-                "topic": discussion.topic,
-                "key_insights": discussion.key_insights,
-                "common_themes": discussion.common_themes,
-                "sentiment_overview": discussion.sentiment_overview,
-                "total_engagement": discussion.total_engagement,
-                "post_summaries": [
-                    {
-                        "original_post_id": ps.original_post_id,
-                        "title": ps.title,
-                        "key_points": ps.key_points,
-                        "sentiment": ps.sentiment,
-                        "topics": ps.topics,
-                        "summary": ps.summary,
-                        "engagement_score": ps.engagement_score,
-                        "url": ps.url,
-                        "subreddit": ps.subreddit,
-                    }
-                    for ps in discussion.post_summaries
-                ],
-            },
-        }
+        discussion_data = {"timestamp": datetime.now(), "discussion": discussion}
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(discussion_data, f, indent=2, ensure_ascii=False)
+        self._write_json(filepath, discussion_data)
 
     def load_discussion(
         self, cache_key: str, max_age_hours: int = 24
@@ -211,26 +287,15 @@ class DataStorage:
             return None
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = orjson.loads(filepath.read_bytes())
 
             discussion_data = data["discussion"]
 
             # Reconstruct post summaries
-            post_summaries = []
-            for ps_data in discussion_data["post_summaries"]:
-                post_summary = PostSummary(
-                    original_post_id=ps_data["original_post_id"],
-                    title=ps_data["title"],
-                    key_points=ps_data["key_points"],
-                    sentiment=ps_data["sentiment"],
-                    topics=ps_data["topics"],
-                    summary=ps_data["summary"],
-                    engagement_score=ps_data["engagement_score"],
-                    url=ps_data["url"],
-                    subreddit=ps_data["subreddit"],
-                )
-                post_summaries.append(post_summary)
+            post_summaries = [
+                _post_summary_from_dict(ps_data)
+                for ps_data in discussion_data["post_summaries"]
+            ]
 
             discussion = DiscussionSummary(
                 topic=discussion_data["topic"],
@@ -239,11 +304,12 @@ class DataStorage:
                 sentiment_overview=discussion_data["sentiment_overview"],
                 post_summaries=post_summaries,
                 total_engagement=discussion_data["total_engagement"],
+                total_posts_analyzed=discussion_data.get("total_posts_analyzed", 0),
             )
 
             return discussion
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading cached discussion: {e}")
             return None
 
@@ -267,10 +333,16 @@ class DataStorage:
     def list_cached_files(self) -> Dict[str, List[str]]:
         """List all cached files by category."""
         return {
-            "posts": [f.stem for f in self.posts_dir.glob("*.json")],
-            "summaries": [f.stem for f in self.summaries_dir.glob("*.json")],
-            "discussions": [f.stem for f in self.discussions_dir.glob("*.json")],
-            "post_summaries": [f.stem for f in self.post_summaries_dir.glob("*.json")],
+            "posts": [key for key, _, _ in self._scan_cache_files(self.posts_dir)],
+            "summaries": [
+                key for key, _, _ in self._scan_cache_files(self.summaries_dir)
+            ],
+            "discussions": [
+                key for key, _, _ in self._scan_cache_files(self.discussions_dir)
+            ],
+            "post_summaries": [
+                row[0] for row in self._execute("SELECT id FROM post_summaries")
+            ],
         }
 
     def clear_cache(
@@ -285,7 +357,6 @@ class DataStorage:
                 self.posts_dir,
                 self.summaries_dir,
                 self.discussions_dir,
-                self.post_summaries_dir,
             ]
         elif category == "posts":
             directories = [self.posts_dir]
@@ -293,142 +364,181 @@ class DataStorage:
             directories = [self.summaries_dir]
         elif category == "discussions":
             directories = [self.discussions_dir]
-        elif category == "post_summaries":
-            directories = [self.post_summaries_dir]
+
+        # Anything last modified before the cutoff is deleted
+        cutoff = (
+            float("inf") if max_age_days is None else time.time() - max_age_days * 86400
+        )
 
         for directory in directories:
-            for filepath in directory.glob("*.json"):
-                should_delete = False
-
-                if max_age_days is None:
-                    should_delete = True
-                else:
-                    file_time = datetime.fromtimestamp(filepath.stat().st_mtime)
-                    if datetime.now() - file_time > timedelta(days=max_age_days):
-                        should_delete = True
-
-                if should_delete:
-                    filepath.unlink()
+            for _, path, st in self._scan_cache_files(directory):
+                if st.st_mtime < cutoff:
+                    os.unlink(path)
                     deleted_count += 1
 
+        if category in (None, "post_summaries"):
+            with self._db_lock:
+                cursor = self.db.execute(
+                    "DELETE FROM post_summaries WHERE mtime < ?", (cutoff,)
+                )
+                self.db.commit()
+            deleted_count += cursor.rowcount
+
         return deleted_count
 
     def save_post_summary(self, post_summary: PostSummary) -> None:
         """Save individual post summary to enable post-level caching."""
-        filepath = self.post_summaries_dir / f"{post_summary.original_post_id}.json"
-
-        summary_data = {
-            "timestamp": datetime.now().isoformat(),
-            "original_post_id": post_summary.original_post_id,
-            "title": post_summary.title,
-            "key_points": post_summary.key_points,
-            "sentiment": post_summary.sentiment,
-            "topics": post_summary.topics,
-            "summary": post_summary.summary,
-            "engagement_score": post_summary.engagement_score,
-            "url": post_summary.url,
-            "subreddit": post_summary.subreddit,
-            "score": post_summary.score,
-            "num_comments": post_summary.num_comments,
-            "is_relevant": post_summary.is_relevant,
-            "relevance_reason": post_summary.relevance_reason,
-            "created_utc": post_summary.created_utc.isoformat()
-            if post_summary.created_utc
-            else None,
-        }
-
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(summary_data, f, indent=2, ensure_ascii=False)
+        self.save_post_summaries([post_summary])
+
+    def save_post_summaries(self, post_summaries: List[PostSummary]) -> None:
+        """Save several post summaries in a single transaction."""
+        mtime = time.time()
+        rows = [
+            (post_summary.original_post_id, mtime, orjson.dumps(post_summary))
+            for post_summary in post_summaries
+        ]
+
+        with self._db_lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO post_summaries (id, mtime, payload) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self.db.commit()
+            # Two saves within one clock tick share an mtime, so the parsed
+            # copies are dropped rather than trusting the timestamp to change
+            for post_summary in post_summaries:
+                self._summary_cache.pop(post_summary.original_post_id, None)
+
+    def _post_summary_from_row(
+        self, post_id: str, mtime: float, payload: bytes
+    ) -> PostSummary:
+        """Return the parsed summary for a row, reusing an earlier parse."""
+        cached = self._summary_cache.get(post_id)
+        if cached is not None and cached[0] == mtime:
+            self._summary_cache.move_to_end(post_id)
+            return cached[1]
+
+        post_summary = _post_summary_from_dict(orjson.loads(payload))
+        self._summary_cache[post_id] = (mtime, post_summary)
+        self._summary_cache.move_to_end(post_id)
+        if len(self._summary_cache) > _SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+        return post_summary
 
     def load_post_summary(
         self, post_id: str, max_age_hours: int = 144
     ) -> Optional[PostSummary]:
         """Load individual post summary if cache is valid."""
-        filepath = self.post_summaries_dir / f"{post_id}.json"
-
-        if not self._is_cache_valid(filepath, max_age_hours):
+        rows = self._query_post_summaries(
+            "id, mtime, payload", [post_id], time.time() - max_age_hours * 3600
+        )
+        if not rows:
             return None
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            created_utc = None
-            if data.get("created_utc"):
-                created_utc = datetime.fromisoformat(data["created_utc"])
-
-            return PostSummary(
-                original_post_id=data["original_post_id"],
-                title=data["title"],
-                key_points=data["key_points"],
-                sentiment=data["sentiment"],
-                topics=data["topics"],
-                summary=data["summary"],
-                engagement_score=data["engagement_score"],
-                url=data["url"],
-                subreddit=data["subreddit"],
-                score=data.get("score", 0),
-                num_comments=data.get("num_comments", 0),
-                is_relevant=data.get("is_relevant", True),
-                relevance_reason=data.get("relevance_reason", ""),
-                created_utc=created_utc,
-            )
+            return self._post_summary_from_row(*rows[0])
 
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+        except (orjson.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading cached post summary for {post_id}: {e}")
             return None
 
-    def load_summaries_with_post_cache(
+    def partition_by_cache(
         self, posts: List[RedditPost], max_age_hours: int = 144
-    ) -> List[PostSummary]:
-        """Load summaries using post-level caching. Returns cached summaries and list of posts that need analysis."""
-        cached_summaries = []
+    ) -> Tuple[List[PostSummary], List[RedditPost]]:
+        """Split posts into cached summaries and posts that need analysis.
+
+        Both halves come from a single index query. A post whose cached
+        summary cannot be loaded is returned for analysis.
+        """
+        rows = self._query_post_summaries(
+            "id, mtime, payload",
+            [post.id for post in posts],
+            time.time() - max_age_hours * 3600,
+        )
 
+        rows_by_id = {row[0]: row for row in rows}
+
+        cached_summaries = []
+        posts_needing_analysis = []
         for post in posts:
-            cached_summary = self.load_post_summary(post.id, max_age_hours)
-            if cached_summary:
-                cached_summaries.append(cached_summary)
+            row = rows_by_id.get(post.id)
+            if row is None:
+                posts_needing_analysis.append(post)
+                continue
+            try:
+                cached_summaries.append(self._post_summary_from_row(*row))
+            except (orjson.JSONDecodeError, KeyError, ValueError) as e:
+                print(f"Error loading cached post summary for {post.id}: {e}")
+                posts_needing_analysis.append(post)
 
-        return cached_summaries
+        return cached_summaries, posts_needing_analysis
+
+    def load_summaries_with_post_cache(
+        self, posts: List[RedditPost], max_age_hours: int = 144
+    ) -> List[PostSummary]:
+        """Load summaries using post-level caching. Returns cached summaries and list of posts that need analysis."""
+        return self.partition_by_cache(posts, max_age_hours)[0]
 
     def get_posts_needing_analysis(
         self, posts: List[RedditPost], max_age_hours: int = 144
     ) -> List[RedditPost]:
         """Get list of posts that don't have valid cached summaries."""
-        posts_needing_analysis = []
-
-        for post in posts:
-            if not self.load_post_summary(post.id, max_age_hours):
-                posts_needing_analysis.append(post)
+        cached_ids = {
+            row[0]
+            for row in self._query_post_summaries(
+                "id", [post.id for post in posts], time.time() - max_age_hours * 3600
+            )
+        }
 
-        return posts_needing_analysis
+        return [post for post in posts if post.id not in cached_ids]
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get statistics about cached data."""
         stats = {}
+        directories = {
+            "posts": self.posts_dir,
+            "summaries": self.summaries_dir,
+            "discussions": self.discussions_dir,
+        }
 
-        for category, directory in [
-            ("posts", self.posts_dir),
-            ("summaries", self.summaries_dir),
-            ("discussions", self.discussions_dir),
-            ("post_summaries", self.post_summaries_dir),
-        ]:
-            files = list(directory.glob("*.json"))
-            total_size = sum(f.stat().st_size for f in files)
+        # Scan the directories concurrently so slow stat() calls overlap
+        with ThreadPoolExecutor(max_workers=len(directories)) as executor:
+            scans = dict(
+                zip(
+                    directories,
+                    executor.map(self._scan_cache_files, directories.values()),
+                )
+            )
+
+        for category, files in scans.items():
+            total_size = sum(st.st_size for _, _, st in files)
 
             stats[category] = {
                 "file_count": len(files),
                 "total_size_mb": round(total_size / (1024 * 1024), 2),
                 "files": [
                     {
-                        "name": f.stem,
-                        "size_kb": round(f.stat().st_size / 1024, 2),
-                        "modified": datetime.fromtimestamp(
-                            f.stat().st_mtime
-                        ).isoformat(),
+                        "name": key,
+                        "size_kb": round(st.st_size / 1024, 2),
+                        "modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
                     }
-                    for f in files
+                    for key, _, st in files
                 ],
             }
 
+        rows = self._execute("SELECT id, length(payload), mtime FROM post_summaries")
+        stats["post_summaries"] = {
+            "file_count": len(rows),
+            "total_size_mb": round(sum(row[1] for row in rows) / (1024 * 1024), 2),
+            "files": [
+                {
+                    "name": post_id,
+                    "size_kb": round(size / 1024, 2),
+                    "modified": datetime.fromtimestamp(mtime).isoformat(),
+                }
+                for post_id, size, mtime in rows
+            ],
+        }
+
         return stats
@@ -1,15 +1,222 @@
 import asyncio
+import hashlib
+import logging
+import math
 import os
-from dataclasses import dataclass
+import random
+import re
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import orjson
+from aiolimiter import AsyncLimiter
 from openai import AsyncAzureOpenAI
 
 from .crawler import RedditPost
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Maximum number of LLM analyses kept for reuse by near-duplicate posts
+_RESPONSE_CACHE_SIZE = 4096
+
+# Maximum number of post embeddings kept for semantic cache lookups
+_SEMANTIC_CACHE_SIZE = 1024
+
+# Matches API errors that signal a rate limit and should be retried
+_RATE_LIMIT_RE = re.compile(r"rate_limit|429", re.IGNORECASE)
+
+# Structured-output mode: every prompt asks for a single JSON object
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Prompt size limits in tokens, estimated at about four characters per token
+_CHARS_PER_TOKEN = 4
+_BODY_TOKEN_LIMIT = 4000
+_COMMENT_TOKEN_LIMIT = 300
+_COMMENTS_TOKEN_BUDGET = 1500
+
+# Links carry no meaning the model can use, so they are stripped from prompts
+_URL_RE = re.compile(r"https?://\S+")
+
+_SYSTEM_PROMPT = "You are an AI expert analyzing Reddit discussions about AI agents. Always respond with valid JSON."
+
+# The relevance rubric is identical for every post, so it lives in the system
+# message where it forms a stable prefix that Azure OpenAI can prompt-cache
+_RELEVANCE_SYSTEM_PROMPT = f"""{_SYSTEM_PROMPT}
+
+STRICT RELEVANCE CRITERIA - Set "is_relevant" to FALSE if the post is:
+❌ Subreddit rules, guidelines, or meta announcements
+❌ Moderator posts about community features or policies
+❌ Off-topic discussions not about AI coding tools
+❌ Empty posts, memes, or low-effort content
+❌ General AI discussions without coding/development focus
+❌ Posts about non-coding AI applications (art, writing, etc.)
+❌ Technical support for non-AI tools
+❌ Job postings or recruitment
+
+✅ Set "is_relevant" to TRUE only if the post contains:
+✅ Discussions about AI coding assistants (Claude Code, Copilot, Cursor, etc.)
+✅ User experiences with AI development tools
+✅ Technical comparisons of AI coding platforms
+✅ Workflows, tips, or best practices for AI-assisted coding
+✅ Problems, limitations, or improvements for coding AI
+✅ Code generation, debugging, or refactoring with AI
+✅ AI agent behavior in software development contexts
+
+Focus on CODING and DEVELOPMENT discussions only. Exclude all meta/administrative content.
+
+Decide relevance first. For a post that is NOT relevant, respond with only "is_relevant" and "relevance_reason" (and "id" when analyzing several posts) and omit all other fields.
+"""
+
+
+# Instructions and response schemas come before the post data in each user
+# message, so the whole static text forms the prompt-cacheable prefix
+_POST_PROMPT_PREFIX = """Analyze this Reddit post and determine if it's a substantive discussion about AI coding agents/tools.
+
+Please provide a JSON response with the following structure:
+{
+    "is_relevant": true|false,
+    "relevance_reason": "Brief explanation if not relevant",
+    "key_points": ["point1", "point2", "point3"],
+    "sentiment": "positive|negative|neutral|mixed",
+    "topics": ["topic1", "topic2", "topic3"],
+    "summary": "2-3 sentence summary of the main discussion",
+    "engagement_score": 1-10
+}
+"""
+
+_BATCH_PROMPT_PREFIX = """Analyze each of these Reddit posts and determine if it's a substantive discussion about AI coding agents/tools.
+
+Please provide a JSON response with one entry per post, in the same order, with the following structure:
+{
+    "posts": [
+        {
+            "id": "the POST ID given below",
+            "is_relevant": true|false,
+            "relevance_reason": "Brief explanation if not relevant",
+            "key_points": ["point1", "point2", "point3"],
+            "sentiment": "positive|negative|neutral|mixed",
+            "topics": ["topic1", "topic2", "topic3"],
+            "summary": "2-3 sentence summary of the main discussion",
+            "engagement_score": 1-10
+        }
+    ]
+}
+"""
+
+_DISCUSSION_SYSTEM_PROMPT = f"""{_SYSTEM_PROMPT}
+
+When summarizing a discussion, focus on:
+1. Identifying the main topic or trend being discussed
+2. Key insights about AI agents from across all posts
+3. Common themes, concerns, or interests
+4. Overall sentiment patterns
+5. Notable trends or emerging topics
+"""
+
+_DISCUSSION_PROMPT_PREFIX = """Analyze these Reddit post summaries about AI agents and create an overall discussion summary.
+
+Please provide a JSON response with the following structure:
+{
+    "topic": "Main overarching topic",
+    "key_insights": ["insight1", "insight2", "insight3"],
+    "common_themes": ["theme1", "theme2", "theme3"],
+    "sentiment_overview": "Description of overall sentiment trends"
+}
+"""
+
+
+class _TooManyFailures(Exception):
+    """Raised to stop summarizing once too many posts have failed."""
+
+
+def _compact(text: str) -> str:
+    """Shrink Reddit text for a prompt without losing what the author said.
+
+    Quoted lines (``>``) repeat other comments and are dropped, links are
+    removed, runs of whitespace collapse to one space and blank lines go.
+    """
+    lines = []
+    for line in text.splitlines():
+        if line.lstrip().startswith(">"):
+            continue
+        line = " ".join(_URL_RE.sub("", line).split())
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _truncate_middle(text: str, max_chars: int) -> str:
+    """Cut text to max_chars by removing its middle, keeping both ends."""
+    if len(text) <= max_chars:
+        return text
+    half = (max_chars - 7) // 2
+    return f"{text[:half]} [...] {text[len(text) - half :]}"
+
+
+_CLOSING_BRACKETS = {"{": "}", "[": "]"}
+
+
+def _matching_close(content: str, start: int) -> Optional[int]:
+    """Return the index closing the bracket at ``start``, or None.
+
+    Brackets inside strings are skipped, and a closing bracket of the wrong
+    type ends the scan, since the text cannot be valid JSON.
+    """
+    expected = []
+    in_string = False
+    escaped = False
+    for end in range(start, len(content)):
+        char = content[end]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSING_BRACKETS:
+            expected.append(_CLOSING_BRACKETS[char])
+        elif char in "}]":
+            if char != expected.pop():
+                return None
+            if not expected:
+                return end
+
+    return None
+
+
+def _parse_json_response(content: str):
+    """Parse an LLM response as JSON, or None if it contains no valid JSON.
+
+    Responses wrapped in other text are handled by scanning each opening
+    brace to its matching close and returning the first object that parses,
+    so bracketed prose before the JSON, e.g. "[1]", is skipped.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        pass
+
+    start = content.find("{")
+    while start != -1:
+        end = _matching_close(content, start)
+        if end is not None:
+            try:
+                return orjson.loads(content[start : end + 1])
+            except orjson.JSONDecodeError:
+                pass
+        start = content.find("{", start + 1)
+
+    return None
+
+
+# Summaries are frozen because storage hands out memoized, shared instances;
+# variants are derived with dataclasses.replace instead
+@dataclass(slots=True, frozen=True)
 class PostSummary:
     """Represents a summarized Reddit post."""
 
@@ -29,7 +236,7 @@ class PostSummary:
     created_utc: Optional[datetime] = None  # Post creation date
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiscussionSummary:
     """Represents a summary of multiple related posts."""
 
@@ -51,33 +258,132 @@ class LLMSummarizer:
         endpoint: str,
         deployment: str,
         api_version: str = "2024-12-01-preview",
+        batch_size: int = 5,
+        rpm: int = 300,
+        post_max_tokens: int = 512,
+        discussion_max_tokens: int = 1024,
+        embedding_deployment: Optional[str] = None,
+        semantic_threshold: float = 0.92,
     ):
-        """Initialize the LLM summarizer with Azure OpenAI credentials."""
-        self.async_client = AsyncAzureOpenAI(
-            api_key=api_key,
-            azure_endpoint=endpoint,
-            api_version=api_version,
-        )
+        """Initialize the LLM summarizer with Azure OpenAI credentials.
+
+        Up to ``batch_size`` posts are analyzed per chat completion, so the
+        relevance rubric is sent once per batch rather than once per post.
+        Requests are paced to at most ``rpm`` per minute, matching the
+        deployment's rate limit, so bursts do not trigger 429 retries.
+        Completions are capped at ``post_max_tokens`` per analyzed post and
+        ``discussion_max_tokens`` per discussion summary, sized to the JSON
+        schemas requested; raise them for reasoning deployments, whose hidden
+        reasoning tokens count against the same limit.
+
+        When an ``embedding_deployment`` is given, posts are embedded before
+        analysis and a post whose embedding has cosine similarity of at least
+        ``semantic_threshold`` with an earlier post reuses that analysis.
+        """
+        self._client_args = {
+            "api_key": api_key,
+            "azure_endpoint": endpoint,
+            "api_version": api_version,
+        }
+        self.async_client = AsyncAzureOpenAI(**self._client_args)
+        # Only a client built here is rebuilt per loop; one assigned by the
+        # caller is kept as-is
+        self._owned_client = self.async_client
+        self._client_loop = None
         self.deployment = deployment
+        self.batch_size = batch_size
+        self.rpm = rpm
+        self.rate_limiter = AsyncLimiter(rpm, 60)
+        self.post_max_tokens = post_max_tokens
+        self.discussion_max_tokens = discussion_max_tokens
+
+        # Parsed post analyses keyed by normalized post content, so cross-posts
+        # and reposts of the same text skip the LLM call
+        self._response_cache: OrderedDict[str, dict] = OrderedDict()
+
+        # (embedding, analysis) pairs of earlier posts, so paraphrased
+        # reposts are matched by meaning rather than exact text
+        self.embedding_deployment = embedding_deployment
+        self.semantic_threshold = semantic_threshold
+        self._semantic_cache: deque = deque(maxlen=_SEMANTIC_CACHE_SIZE)
 
     @classmethod
     def from_env(cls) -> "LLMSummarizer":
-        """Create an LLMSummarizer instance using environment variables."""
+        """Create an LLMSummarizer instance using environment variables.
+
+        AZURE_POST_MAX_TOKENS and AZURE_DISCUSSION_MAX_TOKENS override the
+        completion token caps, e.g. for reasoning deployments.
+        """
+        token_caps = {}
+        for name, env_var in (
+            ("post_max_tokens", "AZURE_POST_MAX_TOKENS"),
+            ("discussion_max_tokens", "AZURE_DISCUSSION_MAX_TOKENS"),
+        ):
+            if os.getenv(env_var):
+                token_caps[name] = int(os.getenv(env_var))
+
         return cls(
             api_key=os.getenv("AZURE_API_KEY"),
             endpoint=os.getenv("AZURE_ENDPOINT"),
             deployment=os.getenv("AZURE_DEPLOYMENT"),
+            embedding_deployment=os.getenv("AZURE_EMBEDDING_DEPLOYMENT"),
+            **token_caps,
         )
 
-    def _create_post_summary_prompt(self, post: RedditPost) -> str:
-        """Create a prompt for summarizing a single Reddit post."""
-        comments_text = (
-            "\n".join(post.comments[:10]) if post.comments else "No comments"
+    def _format_body(self, post: RedditPost) -> str:
+        """Format a post's compacted body for a prompt, within its token limit.
+
+        Long bodies lose their middle, since posts tend to state the problem
+        up front and the question or conclusion at the end.
+        """
+        return _truncate_middle(
+            _compact(post.body), _BODY_TOKEN_LIMIT * _CHARS_PER_TOKEN
         )
 
-        return f"""
-Analyze this Reddit post and determine if it's a substantive discussion about AI coding agents/tools.
+    def _format_comments(self, post: RedditPost, seen: Optional[set] = None) -> str:
+        """Format a post's top comments for inclusion in a prompt.
+
+        Each comment is truncated to its own token limit, and comments are
+        added until the total comment budget is used up, so one very long
+        comment cannot crowd out the rest or overflow the prompt.
+
+        Comments are compacted first, and lines already included earlier in
+        the prompt, such as copy-pasted text or bot boilerplate, are left
+        out. Pass the same ``seen`` set for every post of a batch prompt to
+        deduplicate across its posts.
+        """
+        comment_chars = _COMMENT_TOKEN_LIMIT * _CHARS_PER_TOKEN
+        budget = _COMMENTS_TOKEN_BUDGET * _CHARS_PER_TOKEN
+        if seen is None:
+            seen = set()
+        comments = []
+        for comment in post.comments[:10]:
+            if budget <= 0:
+                break
+            comment = self._drop_seen_lines(_compact(comment), seen)
+            if not comment:
+                continue
+            comment = comment[: min(comment_chars, budget)]
+            comments.append(comment)
+            budget -= len(comment)
+
+        return "\n".join(comments) if comments else "No comments"
+
+    def _drop_seen_lines(self, text: str, seen: set) -> str:
+        """Remove lines of text already in ``seen`` and record the rest."""
+        lines = []
+        for line in text.splitlines():
+            key = line.lower()
+            if key in seen:
+                continue
+            if key:
+                seen.add(key)
+            lines.append(line)
+        return "\n".join(lines).strip()
 
+    def _create_post_summary_prompt(self, post: RedditPost) -> str:
+        """Create a prompt for summarizing a single Reddit post."""
+        return f"""{_POST_PROMPT_PREFIX}
 POST DETAILS:
 Title: {post.title}
 Subreddit: r/{post.subreddit}
@@ -85,43 +391,91 @@ Score: {post.score}
 Comments: {post.num_comments}
 
 CONTENT:
-{post.body}
+{self._format_body(post)}
 
 TOP COMMENTS:
-{comments_text}
+{self._format_comments(post)}
+"""
 
-Please provide a JSON response with the following structure:
-{{
-    "is_relevant": true|false,
-    "relevance_reason": "Brief explanation if not relevant",
-    "key_points": ["point1", "point2", "point3"],
-    "sentiment": "positive|negative|neutral|mixed",
-    "topics": ["topic1", "topic2", "topic3"],
-    "summary": "2-3 sentence summary of the main discussion",
-    "engagement_score": 1-10
-}}
+    def _create_batch_prompt(self, posts: List[RedditPost]) -> str:
+        """Create a prompt for analyzing several Reddit posts in one request."""
+        seen_lines = set()
+        posts_text = "\n\n".join(
+            f"POST ID: {post.id}\n"
+            f"Title: {post.title}\n"
+            f"Subreddit: r/{post.subreddit}\n"
+            f"Score: {post.score}\n"
+            f"Comments: {post.num_comments}\n"
+            f"CONTENT:\n{self._format_body(post)}\n"
+            f"TOP COMMENTS:\n{self._format_comments(post, seen_lines)}"
+            for post in posts
+        )
 
-STRICT RELEVANCE CRITERIA - Set "is_relevant" to FALSE if the post is:
-❌ Subreddit rules, guidelines, or meta announcements
-❌ Moderator posts about community features or policies
-❌ Off-topic discussions not about AI coding tools
-❌ Empty posts, memes, or low-effort content
-❌ General AI discussions without coding/development focus
-❌ Posts about non-coding AI applications (art, writing, etc.)
-❌ Technical support for non-AI tools
-❌ Job postings or recruitment
+        return f"""{_BATCH_PROMPT_PREFIX}
+POSTS:
+{posts_text}
+"""
 
-✅ Set "is_relevant" to TRUE only if the post contains:
-✅ Discussions about AI coding assistants (Claude Code, Copilot, Cursor, etc.)
-✅ User experiences with AI development tools
-✅ Technical comparisons of AI coding platforms
-✅ Workflows, tips, or best practices for AI-assisted coding
-✅ Problems, limitations, or improvements for coding AI
-✅ Code generation, debugging, or refactoring with AI
-✅ AI agent behavior in software development contexts
+    def _post_identity_text(self, post: RedditPost) -> str:
+        """Return the text that identifies a post's content for reuse.
+
+        Link and image posts have no body, and their titles are often generic
+        ("Question", "Is Cursor down?"), so their URL stands in for the body.
+        """
+        return f"{post.title}\n{post.body[:2000] if post.body.strip() else post.url}"
+
+    def _post_content_key(self, post: RedditPost) -> str:
+        """Key a post by its identifying text, ignoring case and whitespace."""
+        text = " ".join(self._post_identity_text(post).lower().split())
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _post_summary_from_result(self, post: RedditPost, result: dict) -> PostSummary:
+        """Build a PostSummary for a post from the LLM's parsed analysis."""
+        # Check relevance first
+        is_relevant = result.get("is_relevant", True)
+        if not is_relevant:
+            logger.info(
+                "Skipping irrelevant post %s: %s",
+                post.id,
+                result.get("relevance_reason", "Not relevant"),
+            )
+            # Still create a PostSummary for caching, but mark as not relevant
+            return PostSummary(
+                original_post_id=post.id,
+                title=post.title,
+                key_points=[],
+                sentiment="neutral",
+                topics=[],
+                summary="",
+                engagement_score=0,
+                url=post.permalink,
+                subreddit=post.subreddit,
+                score=post.score,
+                num_comments=post.num_comments,
+                is_relevant=False,
+                relevance_reason=result.get("relevance_reason", "Not relevant"),
+                created_utc=post.created_utc,
+            )
 
-Focus on CODING and DEVELOPMENT discussions only. Exclude all meta/administrative content.
-"""
+        # Limit topics to top 3
+        topics = result.get("topics", [])[:3]
+
+        return PostSummary(
+            original_post_id=post.id,
+            title=post.title,
+            key_points=result.get("key_points", []),
+            sentiment=result.get("sentiment", "neutral"),
+            topics=topics,
+            summary=result.get("summary", ""),
+            engagement_score=result.get("engagement_score", post.score // 10),
+            url=post.permalink,
+            subreddit=post.subreddit,
+            score=post.score,
+            num_comments=post.num_comments,
+            is_relevant=is_relevant,
+            relevance_reason=result.get("relevance_reason", ""),
+            created_utc=post.created_utc,
+        )
 
     def _create_discussion_summary_prompt(
         self, post_summaries: List[PostSummary]
@@ -138,175 +492,468 @@ Focus on CODING and DEVELOPMENT discussions only. Exclude all meta/administrativ
             ]
         )
 
-        return f"""
-Analyze these Reddit post summaries about AI agents and create an overall discussion summary.
-
+        return f"""{_DISCUSSION_PROMPT_PREFIX}
 POST SUMMARIES:
 {summaries_text}
+"""
 
-Please provide a JSON response with the following structure:
-{{
-    "topic": "Main overarching topic",
-    "key_insights": ["insight1", "insight2", "insight3"],
-    "common_themes": ["theme1", "theme2", "theme3"],
-    "sentiment_overview": "Description of overall sentiment trends"
-}}
+    async def _bind_client(self) -> None:
+        """Make sure the client and rate limiter belong to the running loop.
+
+        The client and its connection pool are reused for every request made
+        from the same event loop. Both are only rebuilt when called from a
+        new loop, e.g. a later asyncio.run(), since pooled connections and
+        limiter waiters cannot be shared across loops. The replaced client is
+        closed so its connection pool is not leaked.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client_loop is loop:
+            return
+
+        stale_client = None
+        if self._client_loop is not None:
+            if self.async_client is self._owned_client:
+                stale_client = self.async_client
+                self.async_client = AsyncAzureOpenAI(**self._client_args)
+                self._owned_client = self.async_client
+            # The limiter's waiters belong to a loop too, so it is
+            # rebuilt alongside the client
+            self.rate_limiter = AsyncLimiter(self.rpm, 60)
+        self._client_loop = loop
+
+        if stale_client is not None:
+            try:
+                await stale_client.close()
+            except Exception as e:
+                # Its connections may be tied to the old, closed loop
+                logger.debug("Error closing replaced client: %s", e)
+
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, waiting for capacity under the rate limit."""
+        await self._bind_client()
+        async with self.rate_limiter:
+            return await self.async_client.chat.completions.create(**kwargs)
+
+    async def _embed_posts(self, posts: List[RedditPost]) -> List[List[float]]:
+        """Embed the identifying text of each post in one request."""
+        await self._bind_client()
+        async with self.rate_limiter:
+            response = await self.async_client.embeddings.create(
+                model=self.embedding_deployment,
+                input=[self._post_identity_text(post) for post in posts],
+            )
+        return [item.embedding for item in response.data]
+
+    def _semantic_match(self, embedding: List[float]) -> Optional[dict]:
+        """Return the analysis of the most similar earlier post, if close enough.
+
+        Azure OpenAI embeddings are unit length, so their dot product is the
+        cosine similarity.
+        """
+        best, best_similarity = None, self.semantic_threshold
+        for cached_embedding, result in self._semantic_cache:
+            similarity = math.sumprod(embedding, cached_embedding)
+            if similarity >= best_similarity:
+                best, best_similarity = result, similarity
+        return best
+
+    async def _prime_semantic_cache(
+        self, posts: List[RedditPost]
+    ) -> dict[str, List[float]]:
+        """Answer posts similar to earlier ones from the semantic cache.
+
+        Matched analyses are put in the response cache, where the usual
+        lookups find them. Returns the embeddings of the unmatched posts by
+        post id, so their analyses can be added to the semantic cache later.
+        """
+        posts = [post for post in posts if self._cached_response(post) is None]
+        if not posts:
+            return {}
 
-Focus on:
-1. Identifying the main topic or trend being discussed
-2. Key insights about AI agents from across all posts
-3. Common themes, concerns, or interests
-4. Overall sentiment patterns
-5. Notable trends or emerging topics
-"""
+        try:
+            embeddings = await self._embed_posts(posts)
+        except Exception as e:
+            logger.warning("Error embedding posts, skipping semantic cache: %s", e)
+            return {}
+
+        unmatched = {}
+        for post, embedding in zip(posts, embeddings):
+            result = self._semantic_match(embedding)
+            if result is not None:
+                logger.info("♻️ Reusing analysis of a similar post: %s", post.title[:50])
+                self._cache_response(post, result)
+            else:
+                unmatched[post.id] = embedding
+        return unmatched
+
+    async def _llm_json(
+        self,
+        system: str,
+        prompt: str,
+        max_tokens: int,
+        description: str,
+    ):
+        """Request a chat completion and parse its JSON, or None if unparsable.
+
+        Rate-limited requests are retried with jittered exponential backoff;
+        any other error is raised to the caller.
+        """
+        # The request is built once and reused as-is by every retry
+        request = {
+            "model": self.deployment,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "max_completion_tokens": max_tokens,
+            # JSON mode guarantees a bare JSON object, so the orjson fast
+            # path in _parse_json_response almost never has to scan
+            "response_format": _JSON_RESPONSE_FORMAT,
+        }
+
+        for attempt in range(3):
+            try:
+                response = await self._create_completion(**request)
+                break
+            except Exception as e:
+                if attempt == 2 or not _RATE_LIMIT_RE.search(str(e)):
+                    raise
+                # Exponential backoff with jitter to spread out retries
+                wait_time = min(2**attempt, 30) + random.uniform(0, 1)
+                logger.warning(
+                    "Rate limit hit for %s, waiting %.1fs...", description, wait_time
+                )
+                await asyncio.sleep(wait_time)
+
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            # Reasoning deployments can spend the whole cap on hidden tokens
+            # and return empty content, which would otherwise fail silently
+            logger.warning(
+                "Completion for %s hit the %d token cap; raise "
+                "AZURE_POST_MAX_TOKENS or AZURE_DISCUSSION_MAX_TOKENS",
+                description,
+                max_tokens,
+            )
+        return _parse_json_response(choice.message.content or "")
+
+    def _cached_response(self, post: RedditPost) -> Optional[dict]:
+        """Return the cached LLM analysis of a post's content, if any."""
+        content_key = self._post_content_key(post)
+        cached = self._response_cache.get(content_key)
+        if cached is not None:
+            self._response_cache.move_to_end(content_key)
+        return cached
+
+    def _cache_response(self, post: RedditPost, result: dict) -> None:
+        """Remember the LLM analysis of a post's content."""
+        self._response_cache[self._post_content_key(post)] = result
+        if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
 
     async def _summarize_post_async(
         self, post: RedditPost, semaphore: asyncio.Semaphore
     ) -> Optional[PostSummary]:
         """Asynchronously summarize a single Reddit post using LLM with rate limiting."""
+        cached = self._cached_response(post)
+        if cached is not None:
+            return self._post_summary_from_result(post, cached)
+
         async with semaphore:
             try:
-                prompt = self._create_post_summary_prompt(post)
-
-                # Add retry logic for rate limits
-                for attempt in range(3):
-                    try:
-                        response = await self.async_client.chat.completions.create(
-                            model=self.deployment,
-                            messages=[
-                                {
-                                    "role": "system",
-                                    "content": "You are an AI expert analyzing Reddit discussions about AI agents. Always respond with valid JSON.",
-                                },
-                                {"role": "user", "content": prompt},
-                            ],
-                            max_completion_tokens=16384,
-                        )
-                        break
-                    except Exception as e:
-                        if "rate_limit" in str(e).lower() or "429" in str(e):
-                            wait_time = 2**attempt  # Exponential backoff
-                            print(
-                                f"Rate limit hit for post {post.id}, waiting {wait_time}s..."
-                            )
-                            await asyncio.sleep(wait_time)
-                            if attempt == 2:  # Last attempt
-                                raise
-                        else:
-                            raise
-
-                content = response.choices[0].message.content
-
-                # Parse the JSON response
-                import json
+                result = await self._llm_json(
+                    _RELEVANCE_SYSTEM_PROMPT,
+                    self._create_post_summary_prompt(post),
+                    self.post_max_tokens,
+                    f"post {post.id}",
+                )
+                if result is None:
+                    return None
 
-                try:
-                    result = json.loads(content)
-                except json.JSONDecodeError:
-                    # Try to extract JSON from the response if it's wrapped in other text
-                    import re
-
-                    json_match = re.search(r"\{.*\}", content, re.DOTALL)
-                    if json_match:
-                        result = json.loads(json_match.group())
-                    else:
-                        return None
+                summary = self._post_summary_from_result(post, result)
+                self._cache_response(post, result)
+                return summary
 
-                # Check relevance first
-                is_relevant = result.get("is_relevant", True)
-                if not is_relevant:
-                    print(
-                        f"Skipping irrelevant post {post.id}: {result.get('relevance_reason', 'Not relevant')}"
-                    )
-                    # Still create a PostSummary for caching, but mark as not relevant
-                    return PostSummary(
-                        original_post_id=post.id,
-                        title=post.title,
-                        key_points=[],
-                        sentiment="neutral",
-                        topics=[],
-                        summary="",
-                        engagement_score=0,
-                        url=post.permalink,
-                        subreddit=post.subreddit,
-                        score=post.score,
-                        num_comments=post.num_comments,
-                        is_relevant=False,
-                        relevance_reason=result.get("relevance_reason", "Not relevant"),
-                        created_utc=post.created_utc,
+            except Exception as e:
+                logger.error("Error summarizing post %s: %s", post.id, e)
+                return None
+
+    async def _summarize_batch_async(
+        self, posts: List[RedditPost], semaphore: asyncio.Semaphore
+    ) -> List[Optional[PostSummary]]:
+        """Summarize several posts with one LLM request.
+
+        Posts already analyzed under the same content are answered from the
+        response cache. If the batch request fails or leaves posts out of its
+        answer, those posts are retried individually.
+        """
+        summaries: List[Optional[PostSummary]] = [None] * len(posts)
+        pending = {}
+        for index, post in enumerate(posts):
+            cached = self._cached_response(post)
+            if cached is not None:
+                summaries[index] = self._post_summary_from_result(post, cached)
+            else:
+                pending[post.id] = index
+
+        if len(pending) > 1:
+            batch = [posts[index] for index in pending.values()]
+            try:
+                async with semaphore:
+                    batch_result = await self._llm_json(
+                        _RELEVANCE_SYSTEM_PROMPT,
+                        self._create_batch_prompt(batch),
+                        self.post_max_tokens * len(batch),
+                        f"batch of {len(batch)} posts",
                     )
 
-                # Limit topics to top 3
-                topics = result.get("topics", [])[:3]
-
-                return PostSummary(
-                    original_post_id=post.id,
-                    title=post.title,
-                    key_points=result.get("key_points", []),
-                    sentiment=result.get("sentiment", "neutral"),
-                    topics=topics,
-                    summary=result.get("summary", ""),
-                    engagement_score=result.get("engagement_score", post.score // 10),
-                    url=post.permalink,
-                    subreddit=post.subreddit,
-                    score=post.score,
-                    num_comments=post.num_comments,
-                    is_relevant=is_relevant,
-                    relevance_reason=result.get("relevance_reason", ""),
-                    created_utc=post.created_utc,
-                )
+                for result in batch_result["posts"]:
+                    index = pending.pop(str(result.get("id")), None)
+                    if index is None:
+                        continue
+                    post = posts[index]
+                    summaries[index] = self._post_summary_from_result(post, result)
+                    self._cache_response(post, result)
 
             except Exception as e:
-                print(f"Error summarizing post {post.id}: {e}")
-                return None
+                logger.error("Error summarizing batch of %d posts: %s", len(batch), e)
+
+        # Fall back to one request per post for anything the batch missed
+        fallback = await asyncio.gather(
+            *[
+                self._summarize_post_async(posts[index], semaphore)
+                for index in pending.values()
+            ]
+        )
+        for index, summary in zip(pending.values(), fallback):
+            summaries[index] = summary
+
+        return summaries
 
     async def summarize_posts_async(
-        self, posts: List[RedditPost], max_concurrent: int = 5, callback=None
+        self,
+        posts: List[RedditPost],
+        max_concurrent: int = 5,
+        callback=None,
+        batch_callback=None,
     ) -> List[PostSummary]:
-        """Asynchronously summarize multiple Reddit posts with rate limiting."""
+        """Asynchronously summarize multiple Reddit posts with rate limiting.
+
+        Posts are sent in batches of ``batch_size`` per request, with at most
+        ``max_concurrent`` requests in flight. Batches are fed through a
+        bounded queue to a fixed pool of workers, so only the batches being
+        processed hold tasks. Posts with the same content, such as
+        cross-posts, are analyzed once and share the result.
+
+        If more than ``max(10, 5%)`` of the posts fail, e.g. during an API
+        outage, the remaining batches are cancelled and the summaries
+        completed so far are returned.
+
+        ``callback`` is awaited with each relevant summary as it completes.
+        ``batch_callback`` is awaited with every summary of each finished
+        batch, relevant or not, so callers can persist results as they go
+        instead of losing them if the run is interrupted.
+        """
 
-        summaries = []
         semaphore = asyncio.Semaphore(max_concurrent)
-        total_processed = 0
-        relevant_count = 0
-
-        async def process_post_with_callback(i, post):
-            nonlocal total_processed, relevant_count
-            print(f"Processing post {i + 1}/{len(posts)}: {post.title[:50]}...")
-            summary = await self._summarize_post_async(post, semaphore)
-            total_processed += 1
-
-            if summary:
-                summaries.append(summary)
-                if summary.is_relevant:
-                    relevant_count += 1
-                    print(
-                        f"✅ Relevant post {relevant_count} ({total_processed}/{len(posts)}): {post.title[:50]}"
-                    )
-                    if callback:
-                        await callback(
-                            summary
-                        )  # Real-time callback for immediate rendering
-                else:
-                    print(
-                        f"❌ Filtered out post {total_processed}/{len(posts)}: {post.title[:50]} (not relevant)"
-                    )
-            else:
-                print(
-                    f"❌ Error processing post {total_processed}/{len(posts)}: {post.title[:50]} (processing failed)"
+
+        # Group posts by content so only the first of each group is analyzed
+        groups = {}
+        for post in posts:
+            groups.setdefault(self._post_content_key(post), []).append(post)
+        representatives = [group[0] for group in groups.values()]
+        duplicates = {group[0].id: group[1:] for group in groups.values()}
+        summaries_by_id = {}
+        failures = 0
+        embeddings = (
+            await self._prime_semantic_cache(representatives)
+            if self.embedding_deployment
+            else {}
+        )
+        failure_budget = max(10, len(representatives) // 20)
+
+        async def process_batch_with_callback(start, batch):
+            nonlocal failures
+            logger.info(
+                "Processing posts %d-%d/%d...",
+                start + 1,
+                start + len(batch),
+                len(representatives),
+            )
+            batch_summaries = await self._summarize_batch_async(batch, semaphore)
+            completed = []
+
+            for representative, summary in zip(batch, batch_summaries):
+                if summary is None:
+                    failures += 1
+                for post in [representative, *duplicates[representative.id]]:
+                    if summary is not None and post is not representative:
+                        summary = replace(
+                            summary,
+                            original_post_id=post.id,
+                            title=post.title,
+                            url=post.permalink,
+                            subreddit=post.subreddit,
+                            score=post.score,
+                            num_comments=post.num_comments,
+                            created_utc=post.created_utc,
+                        )
+                    summaries_by_id[post.id] = summary
+
+                    if summary is None:
+                        logger.info(
+                            "❌ Error processing post: %s (processing failed)",
+                            post.title[:50],
+                        )
+                    elif summary.is_relevant:
+                        logger.info("✅ Relevant post: %s", post.title[:50])
+                        if callback:
+                            await callback(
+                                summary
+                            )  # Real-time callback for immediate rendering
+                    else:
+                        logger.info(
+                            "❌ Filtered out post: %s (not relevant)", post.title[:50]
+                        )
+                    if summary is not None:
+                        completed.append(summary)
+
+            if batch_callback and completed:
+                await batch_callback(completed)
+
+            if failures > failure_budget:
+                raise _TooManyFailures(failures)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_concurrent * 2)
+
+        async def produce():
+            for start in range(0, len(representatives), self.batch_size):
+                await queue.put(
+                    (start, representatives[start : start + self.batch_size])
                 )
 
-            return summary
+            # One sentinel per worker signals the end of the batches
+            for _ in range(max_concurrent):
+                await queue.put(None)
 
-        # Process all posts concurrently
-        tasks = [process_post_with_callback(i, post) for i, post in enumerate(posts)]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        async def consume():
+            while (item := await queue.get()) is not None:
+                try:
+                    await process_batch_with_callback(*item)
+                except _TooManyFailures:
+                    raise
+                except Exception as e:
+                    logger.error("Error processing batch: %s", e)
 
-        print(
-            f"\n📊 Processing complete: {relevant_count}/{total_processed} posts were relevant and included"
+        # A worker raising _TooManyFailures cancels the rest of the group
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(produce())
+                for _ in range(max_concurrent):
+                    group.create_task(consume())
+        except* _TooManyFailures:
+            logger.error(
+                "Stopped after %d posts failed; returning partial results", failures
+            )
+
+        for post in representatives:
+            embedding = embeddings.get(post.id)
+            if embedding is not None:
+                result = self._cached_response(post)
+                if result is not None:
+                    self._semantic_cache.append((embedding, result))
+
+        summaries = [
+            summaries_by_id[post.id]
+            for post in posts
+            if summaries_by_id.get(post.id) is not None
+        ]
+        relevant_count = sum(1 for summary in summaries if summary.is_relevant)
+
+        logger.info(
+            "\n📊 Processing complete: %d/%d posts were relevant and included",
+            relevant_count,
+            len(posts),
         )
         return summaries
 
+    def _batch_job_request(self, post: RedditPost) -> dict:
+        """Build the Batch API request line for analyzing one post."""
+        return {
+            "custom_id": post.id,
+            "method": "POST",
+            "url": "/chat/completions",
+            "body": {
+                "model": self.deployment,
+                "messages": [
+                    {"role": "system", "content": _RELEVANCE_SYSTEM_PROMPT},
+                    {"role": "user", "content": self._create_post_summary_prompt(post)},
+                ],
+                "max_completion_tokens": self.post_max_tokens,
+                "response_format": _JSON_RESPONSE_FORMAT,
+            },
+        }
+
+    async def submit_batch_job(self, posts: List[RedditPost]) -> str:
+        """Submit posts for analysis through the Azure OpenAI Batch API.
+
+        Batch jobs cost less than online requests but may take up to 24
+        hours. Returns the job id to pass to ``collect_batch_job``.
+        """
+        await self._bind_client()
+        lines = b"".join(
+            orjson.dumps(self._batch_job_request(post)) + b"\n" for post in posts
+        )
+        input_file = await self.async_client.files.create(
+            file=("snooze-batch.jsonl", lines), purpose="batch"
+        )
+        job = await self.async_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/chat/completions",
+            completion_window="24h",
+        )
+        return job.id
+
+    async def collect_batch_job(
+        self, batch_id: str, posts: List[RedditPost]
+    ) -> Tuple[str, Optional[List[PostSummary]]]:
+        """Check a Batch API job and collect its summaries once it completes.
+
+        Returns the job status and, for a completed job, the summaries of the
+        submitted ``posts`` it analyzed successfully; otherwise None.
+        """
+        await self._bind_client()
+        job = await self.async_client.batches.retrieve(batch_id)
+        if job.status != "completed":
+            return job.status, None
+
+        summaries = []
+        if job.output_file_id:
+            posts_by_id = {post.id: post for post in posts}
+            output = await self.async_client.files.content(job.output_file_id)
+            for line in output.text.splitlines():
+                record = orjson.loads(line)
+                post = posts_by_id.get(record.get("custom_id"))
+                response = record.get("response") or {}
+                if post is None or response.get("status_code") != 200:
+                    continue
+
+                choice = response["body"]["choices"][0]
+                if choice.get("finish_reason") == "length":
+                    logger.warning(
+                        "Batch completion for post %s hit the %d token cap",
+                        post.id,
+                        self.post_max_tokens,
+                    )
+                result = _parse_json_response(choice["message"]["content"] or "")
+                if result is None:
+                    continue
+
+                summaries.append(self._post_summary_from_result(post, result))
+                self._cache_response(post, result)
+
+        return job.status, summaries
+
     async def _create_discussion_summary_async(
         self, post_summaries: List[PostSummary]
     ) -> Optional[DiscussionSummary]:
@@ -315,35 +962,14 @@ Focus on:
             return None
 
         try:
-            prompt = self._create_discussion_summary_prompt(post_summaries)
-
-            response = await self.async_client.chat.completions.create(
-                model=self.deployment,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an AI expert analyzing Reddit discussions about AI agents. Always respond with valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_completion_tokens=16384,
+            result = await self._llm_json(
+                _DISCUSSION_SYSTEM_PROMPT,
+                self._create_discussion_summary_prompt(post_summaries),
+                self.discussion_max_tokens,
+                "discussion summary",
             )
-
-            content = response.choices[0].message.content
-
-            # Parse the JSON response
-            import json
-
-            try:
-                result = json.loads(content)
-            except json.JSONDecodeError:
-                import re
-
-                json_match = re.search(r"\{.*\}", content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    return None
+            if result is None:
+                return None
 
             total_engagement = sum(
                 summary.engagement_score for summary in post_summaries
@@ -360,7 +986,7 @@ Focus on:
             )
 
         except Exception as e:
-            print(f"Error creating discussion summary: {e}")
+            logger.error("Error creating discussion summary: %s", e)
             return None
 
     def analyze_trends(self, discussion_summaries: List[DiscussionSummary]) -> dict:
@@ -368,31 +994,28 @@ Focus on:
         if not discussion_summaries:
             return {}
 
-        # Aggregate themes
-        all_themes = []
+        # Aggregate themes, sentiments and totals in a single pass
+        theme_counts = Counter()
         sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0, "mixed": 0}
+        total_posts = 0
+        total_engagement = 0
 
         for discussion in discussion_summaries:
-            all_themes.extend(discussion.common_themes)
+            theme_counts.update(discussion.common_themes)
+            total_engagement += discussion.total_engagement
 
             # Count sentiments from individual posts
-            for post_summary in discussion.post_summaries:
+            post_summaries = discussion.post_summaries
+            total_posts += len(post_summaries)
+            for post_summary in post_summaries:
                 sentiment = post_summary.sentiment.lower()
                 if sentiment in sentiment_counts:
                     sentiment_counts[sentiment] += 1
 
-        # Count theme frequency
-        from collections import Counter
-
-        theme_counts = Counter(all_themes)
-
         return {
             "top_themes": theme_counts.most_common(10),
             "sentiment_distribution": sentiment_counts,
             "total_discussions": len(discussion_summaries),
-            "total_posts": sum(len(d.post_summaries) for d in discussion_summaries),
-            "average_engagement": sum(d.total_engagement for d in discussion_summaries)
-            / len(discussion_summaries)
-            if discussion_summaries
-            else 0,
+            "total_posts": total_posts,
+            "average_engagement": total_engagement / len(discussion_summaries),
         }
@@ -1,15 +1,46 @@
 import asyncio
+import logging
 import os
+import threading
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from flask import Flask, jsonify, render_template, request
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
 
-from .crawler import RedditCrawler
+from .crawler import DEFAULT_SUBREDDITS, RedditCrawler
 from .storage import DataStorage
 from .summarizer import DiscussionSummary, LLMSummarizer, PostSummary
 
+logger = logging.getLogger(__name__)
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+_TEMPLATES_PATH = os.path.join(_PACKAGE_DIR, "templates")
+_STATIC_PATH = os.path.join(_PACKAGE_DIR, "static")
+
+# Port chosen by run(), passed to the debug reloader's child process
+_RESOLVED_PORT_ENV = "SNOOZE_RESOLVED_PORT"
+
+
+class _OrjsonProvider(JSONProvider):
+    """Flask JSON provider that serializes responses with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the str round trip of dumps() and send orjson's bytes as-is
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+            mimetype="application/json",
+        )
+
 
 class SnoozeVisualizer:
     """Web visualizer for Reddit AI agent discussions."""
@@ -23,32 +54,35 @@ class SnoozeVisualizer:
             template_folder=template_folder or self._get_templates_path(),
             static_folder=static_folder or self._get_static_path(),
         )
+        self.app.json = _OrjsonProvider(self.app)
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
         self.crawler = None
         self.summarizer = None
         self.storage = DataStorage()
+        self._loop = None
+        self._loop_lock = threading.Lock()
         self._setup_routes()
         self._setup_socketio_events()
 
     def _get_templates_path(self) -> str:
         """Get the path to the templates directory."""
-        return os.path.join(os.path.dirname(__file__), "templates")
+        return _TEMPLATES_PATH
 
     def _get_static_path(self) -> str:
         """Get the path to the static files directory."""
-        return os.path.join(os.path.dirname(__file__), "static")
+        return _STATIC_PATH
 
     def _setup_socketio_events(self):
         """Setup SocketIO event handlers."""
 
         @self.socketio.on("connect")
         def handle_connect():
-            print("Client connected")
+            logger.info("Client connected")
             emit("connected", {"status": "Connected to Snooze server"})
 
         @self.socketio.on("disconnect")
         def handle_disconnect():
-            print("Client disconnected")
+            logger.info("Client disconnected")
 
     def _setup_routes(self):
         """Setup Flask routes."""
@@ -64,17 +98,7 @@ class SnoozeVisualizer:
             try:
                 data = request.get_json()
                 limit = data.get("limit", 50)
-                subreddits = data.get(
-                    "subreddits",
-                    [
-                        "vibecoding",
-                        "ClaudeCode",
-                        "codex",
-                        "GithubCopilot",
-                        "ChatGPTCoding",
-                        "cursor",
-                    ],
-                )
+                subreddits = data.get("subreddits", DEFAULT_SUBREDDITS)
 
                 # Start async analysis in background
                 self.socketio.start_background_task(
@@ -86,6 +110,69 @@ class SnoozeVisualizer:
             except Exception as e:
                 return jsonify({"success": False, "error": str(e)}), 500
 
+        @self.app.route("/api/analyze-batch", methods=["POST"])
+        def analyze_batch():
+            """API endpoint to submit posts for analysis as an Azure batch job."""
+            try:
+                data = request.get_json()
+                limit = data.get("limit", 50)
+                subreddits = data.get("subreddits", DEFAULT_SUBREDDITS)
+
+                batch_id, post_count = self._run_coroutine(
+                    self._submit_batch_analysis(subreddits, limit)
+                )
+                if batch_id is None:
+                    return jsonify(
+                        {
+                            "success": True,
+                            "batch_id": None,
+                            "message": "All posts already have cached summaries",
+                        }
+                    )
+
+                return jsonify(
+                    {
+                        "success": True,
+                        "batch_id": batch_id,
+                        "post_count": post_count,
+                        "message": f"Submitted {post_count} posts for batch analysis",
+                    }
+                )
+
+            except Exception as e:
+                return jsonify({"success": False, "error": str(e)}), 500
+
+        @self.app.route("/api/batch/<batch_id>/status")
+        def batch_status(batch_id):
+            """Check a batch analysis job and return its summaries once done."""
+            posts = self.storage.load_posts(f"batch_{batch_id}", max_age_hours=48)
+            if posts is None:
+                return jsonify({"success": False, "error": "Unknown batch job"}), 404
+
+            try:
+                self._init_components()
+                status, summaries = self._run_coroutine(
+                    self.summarizer.collect_batch_job(batch_id, posts)
+                )
+            except Exception as e:
+                return jsonify({"success": False, "error": str(e)}), 500
+
+            if summaries is None:
+                return jsonify({"success": True, "status": status})
+
+            self.storage.save_post_summaries(summaries)
+            return jsonify(
+                {
+                    "success": True,
+                    "status": status,
+                    "summaries": [
+                        self._serialize_post_summary(summary)
+                        for summary in summaries
+                        if summary.is_relevant
+                    ],
+                }
+            )
+
         @self.app.route("/api/posts")
         def get_posts():
             """Get latest analyzed posts."""
@@ -134,11 +221,65 @@ class SnoozeVisualizer:
                 }
             )
 
+    def _run_coroutine(self, coro):
+        """Run a coroutine on the shared event loop and wait for its result.
+
+        All async work runs on one long-lived loop in a daemon thread, so the
+        crawler's and summarizer's HTTP sessions and connection pools stay
+        bound to a live loop and are reused across requests.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="snooze-loop", daemon=True
+                ).start()
+
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _init_components(self):
+        """Create the Reddit crawler and LLM summarizer on first use."""
+        if not self.crawler:
+            self.crawler = RedditCrawler.from_env()
+        if not self.summarizer:
+            self.summarizer = LLMSummarizer.from_env()
+
+    async def _load_or_crawl_posts(self, subreddits, limit):
+        """Load recently crawled posts from the cache, or crawl and cache them."""
+        posts_cache_key = self.storage.generate_posts_cache_key(subreddits, limit)
+
+        posts = self.storage.load_posts(posts_cache_key, max_age_hours=6)
+        if not posts:
+            posts = await self.crawler.get_all_coding_discussions_async(limit=limit)
+            if posts:
+                await asyncio.to_thread(self.storage.save_posts, posts, posts_cache_key)
+
+        return posts
+
+    async def _submit_batch_analysis(self, subreddits, limit):
+        """Submit uncached posts as a batch job, returning its id and size.
+
+        The submitted posts are stored under the job id so its results can
+        be mapped back to them when the job completes.
+        """
+        self._init_components()
+        posts = await self._load_or_crawl_posts(subreddits, limit)
+        _, posts_needing_analysis = self.storage.partition_by_cache(
+            posts or [], max_age_hours=144
+        )
+        if not posts_needing_analysis:
+            return None, 0
+
+        batch_id = await self.summarizer.submit_batch_job(posts_needing_analysis)
+        await asyncio.to_thread(
+            self.storage.save_posts, posts_needing_analysis, f"batch_{batch_id}"
+        )
+        return batch_id, len(posts_needing_analysis)
+
     def _run_async_analysis(self, subreddits, limit):
         """Run async analysis with real-time updates via WebSocket."""
         try:
-            # Use asyncio.run() for proper event loop management
-            asyncio.run(self._async_analysis_process(subreddits, limit))
+            self._run_coroutine(self._async_analysis_process(subreddits, limit))
         except Exception as e:
             self.socketio.emit("error", {"message": str(e)})
 
@@ -146,24 +287,14 @@ class SnoozeVisualizer:
         """The actual async analysis process."""
         try:
             # Initialize components if not already done
-            if not self.crawler:
-                self.crawler = RedditCrawler.from_env()
-            if not self.summarizer:
-                self.summarizer = LLMSummarizer.from_env()
+            self._init_components()
 
             self.socketio.emit(
                 "progress", {"stage": "crawling", "message": "Crawling Reddit posts..."}
             )
 
-            # Generate cache keys
-            posts_cache_key = self.storage.generate_posts_cache_key(subreddits, limit)
-
             # Try to load cached posts first
-            posts = self.storage.load_posts(posts_cache_key, max_age_hours=6)
-            if not posts:
-                posts = await self.crawler.get_all_coding_discussions_async(limit=limit)
-                if posts:
-                    self.storage.save_posts(posts, posts_cache_key)
+            posts = await self._load_or_crawl_posts(subreddits, limit)
 
             if not posts:
                 self.socketio.emit("error", {"message": "No posts found to analyze"})
@@ -179,10 +310,7 @@ class SnoozeVisualizer:
             )
 
             # Use post-level caching for efficient summary retrieval
-            cached_summaries = self.storage.load_summaries_with_post_cache(
-                posts, max_age_hours=144
-            )
-            posts_needing_analysis = self.storage.get_posts_needing_analysis(
+            cached_summaries, posts_needing_analysis = self.storage.partition_by_cache(
                 posts, max_age_hours=144
             )
 
@@ -217,9 +345,8 @@ class SnoozeVisualizer:
             if posts_needing_analysis:
 
                 async def progress_callback(summary):
-                    # Save each summary as it's completed
+                    # Track each summary as it's completed
                     if summary:
-                        self.storage.save_post_summary(summary)
                         all_summaries.append(summary)
 
                         # Emit real-time update for new analysis (only relevant ones)
@@ -238,8 +365,18 @@ class SnoozeVisualizer:
                                 },
                             )
 
+                async def save_batch(batch_summaries):
+                    # Cache each finished batch, relevant or not, in one
+                    # transaction on a worker thread, so an interrupted run
+                    # keeps what it already paid for
+                    await asyncio.to_thread(
+                        self.storage.save_post_summaries, batch_summaries
+                    )
+
                 new_summaries = await self.summarizer.summarize_posts_async(
-                    posts_needing_analysis, callback=progress_callback
+                    posts_needing_analysis,
+                    callback=progress_callback,
+                    batch_callback=save_batch,
                 )
             else:
                 new_summaries = []
@@ -261,10 +398,17 @@ class SnoozeVisualizer:
                 },
             )
 
-            # Save combined summaries for backward compatibility
-            if relevant_summaries:
-                summaries_cache_key = self.storage.generate_summaries_cache_key(posts)
-                self.storage.save_summaries(relevant_summaries, summaries_cache_key)
+            # Save combined summaries for backward compatibility. When every
+            # summary came from the cache, an existing file is already current.
+            summaries_cache_key = self.storage.generate_summaries_cache_key(posts)
+            if relevant_summaries and (
+                new_summaries or not self.storage.has_summaries(summaries_cache_key)
+            ):
+                await asyncio.to_thread(
+                    self.storage.save_summaries,
+                    relevant_summaries,
+                    summaries_cache_key,
+                )
 
             if not relevant_summaries:
                 # Still emit completion status even if no relevant posts found
@@ -302,7 +446,9 @@ class SnoozeVisualizer:
                     relevant_summaries
                 )
                 if discussion:
-                    self.storage.save_discussion(discussion, discussion_cache_key)
+                    await asyncio.to_thread(
+                        self.storage.save_discussion, discussion, discussion_cache_key
+                    )
 
             if discussion:
                 self.socketio.emit(
@@ -320,7 +466,7 @@ class SnoozeVisualizer:
                 )
 
         except Exception as e:
-            print(f"Error in async analysis: {e}")
+            logger.error("Error in async analysis: %s", e)
             self.socketio.emit("error", {"message": f"Analysis failed: {str(e)}"})
 
     def _serialize_discussion(self, discussion: DiscussionSummary) -> dict:
@@ -363,29 +509,33 @@ class SnoozeVisualizer:
         """Run the Flask-SocketIO development server."""
         import socket
 
-        # Check if port is available
-        def is_port_available(host, port):
-            try:
+        if os.environ.get("WERKZEUG_RUN_MAIN") == "true" and os.environ.get(
+            _RESOLVED_PORT_ENV
+        ):
+            # The debug reloader re-runs this in a child process, which must
+            # serve on the port the parent resolved and printed
+            port = int(os.environ[_RESOLVED_PORT_ENV])
+        else:
+            # Find an available port if the default is taken, scanning forward
+            # so the choice is stable across restarts
+            original_port = port
+            for port in range(original_port, original_port + 100):
                 with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind((host, port))
-                    return True
-            except OSError:
-                return False
-
-        # Find an available port if the default is taken
-        original_port = port
-        while not is_port_available(host, port) and port < original_port + 100:
-            port += 1
-
-        if port != original_port:
-            print(f"Port {original_port} is in use, using port {port} instead")
-
-        if not is_port_available(host, port):
-            print(
-                f"Error: Could not find an available port starting from {original_port}"
-            )
-            print("Try specifying a different port with --port <port_number>")
-            return
+                    try:
+                        s.bind((host, port))
+                        break
+                    except OSError:
+                        continue
+            else:
+                print(
+                    f"Error: Could not find an available port starting from {original_port}"
+                )
+                print("Try specifying a different port with --port <port_number>")
+                return
+
+            if port != original_port:
+                print(f"Port {original_port} is in use, using port {port} instead")
+            os.environ[_RESOLVED_PORT_ENV] = str(port)
 
         print(f"Starting Snooze visualizer at http://{host}:{port}")
         try:
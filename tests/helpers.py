@@ -0,0 +1,14 @@
+"""Shared helpers for the Snooze test modules."""
+
+import os
+import unittest
+from datetime import datetime
+
+# Live tests hit the real Reddit and Azure OpenAI APIs, so they are opt-in
+live_test = unittest.skipUnless(
+    os.getenv("SNOOZE_LIVE_TESTS"),
+    "Live API tests run only with SNOOZE_LIVE_TESTS=1",
+)
+
+# Fixed creation time so fixtures are deterministic; naive like crawled posts
+CREATED_UTC = datetime(2024, 1, 1, 12, 0)
@@ -1,31 +1,44 @@
 #!/usr/bin/env python3
 """Test script for the Reddit crawler component."""
 
+import asyncio
 import os
 import unittest
 from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import dotenv
+from helpers import CREATED_UTC, live_test
 
 from snooze.crawler import RedditCrawler, RedditPost
 
 dotenv.load_dotenv()
 
 
+class _FakeComments(list):
+    """A loaded comment forest: a plain list with an awaitable replace_more."""
+
+    def __init__(self, comments=()):
+        super().__init__(comments)
+        self.replace_more = AsyncMock()
+
+
 class TestRedditCrawler(unittest.TestCase):
     """Test cases for RedditCrawler."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.client_id = os.getenv("REDDIT_CLIENT_ID", "test_id")
-        self.client_secret = os.getenv("REDDIT_CLIENT_SECRET", "test_secret")
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test in the class."""
+        cls.client_id = os.getenv("REDDIT_CLIENT_ID", "test_id")
+        cls.client_secret = os.getenv("REDDIT_CLIENT_SECRET", "test_secret")
+        # Tests only patch the crawler's client in scoped context managers,
+        # so one instance can be shared instead of building one per test
+        cls.crawler = RedditCrawler(cls.client_id, cls.client_secret)
 
     def test_initialization(self):
         """Test crawler initialization."""
-        crawler = RedditCrawler(self.client_id, self.client_secret)
-        self.assertIsNotNone(crawler.reddit)
-        self.assertEqual(crawler.reddit.config.client_id, self.client_id)
+        self.assertIsNotNone(self.crawler.async_reddit)
+        self.assertEqual(self.crawler.async_reddit.config.client_id, self.client_id)
 
     def test_from_env(self):
         """Test creating crawler from environment variables."""
@@ -34,11 +47,11 @@ class TestRedditCrawler(unittest.TestCase):
             {"REDDIT_CLIENT_ID": "env_id", "REDDIT_CLIENT_SECRET": "env_secret"},
         ):
             crawler = RedditCrawler.from_env()
-            self.assertEqual(crawler.reddit.config.client_id, "env_id")
+            self.assertEqual(crawler.async_reddit.config.client_id, "env_id")
 
     def test_submission_to_post(self):
         """Test converting submission to RedditPost."""
-        crawler = RedditCrawler(self.client_id, self.client_secret)
+        crawler = self.crawler
 
         # Mock submission
         mock_submission = Mock()
@@ -53,14 +66,11 @@ class TestRedditCrawler(unittest.TestCase):
         mock_submission.subreddit = "test"
         mock_submission.permalink = "/r/test/comments/test123/"
 
-        # Mock comments
-        mock_comments = Mock()
-        mock_comments.__iter__ = Mock(return_value=iter([]))
-        mock_comments.__getitem__ = Mock(side_effect=lambda x: [][x])
-        mock_comments.replace_more = Mock()
-        mock_submission.comments = mock_comments
+        mock_submission.comments = _FakeComments()
 
-        post = crawler._submission_to_post(mock_submission, include_comments=False)
+        post = asyncio.run(
+            crawler._submission_to_post_async(mock_submission, include_comments=False)
+        )
 
         self.assertEqual(post.id, "test123")
         self.assertEqual(post.title, "Test Post")
@@ -70,8 +80,219 @@ class TestRedditCrawler(unittest.TestCase):
         self.assertEqual(post.num_comments, 5)
         self.assertEqual(post.url, "https://reddit.com/r/test/test123")
         self.assertEqual(post.subreddit, "test")
+        self.assertEqual(post.created_utc, datetime.fromtimestamp(1672531200))
+        self.assertEqual(post.permalink, "https://reddit.com/r/test/comments/test123/")
         self.assertEqual(len(post.comments), 0)
 
+    def test_extract_comments(self):
+        """Test extracting top-level comment bodies from a submission."""
+        crawler = self.crawler
+
+        bodies = ["First", "[deleted]", "", "Second", "Third"]
+        mock_comments = _FakeComments(Mock(body=body) for body in bodies)
+        mock_submission = Mock()
+        mock_submission.comments = mock_comments
+
+        comments = asyncio.run(
+            crawler._extract_comments_async(mock_submission, max_comments=2)
+        )
+
+        self.assertEqual(comments, ["First", "Second"])
+        mock_comments.replace_more.assert_awaited_once_with(limit=0)
+
+    def test_fetch_subreddit_filters_and_keeps_order(self):
+        """Test that subreddit fetching filters posts and keeps listing order."""
+        crawler = self.crawler
+
+        listing = [
+            Mock(id="a", title="Claude Code tips", selftext=""),
+            Mock(id="b", title="My cat", selftext="Nothing to see here"),
+            Mock(id="c", title="Question", selftext="How do I debug this?"),
+            Mock(id="d", title="Copilot review", selftext=""),
+            Mock(id="e", title="Cursor AI rules", selftext=""),
+        ]
+
+        async def hot(limit):
+            for submission in listing[:limit]:
+                yield submission
+
+        subreddit = Mock()
+        subreddit.hot = hot
+
+        async def fake_convert(submission, include_comments):
+            await asyncio.sleep(0.01 if submission.id == "a" else 0)
+            return submission.id
+
+        with (
+            patch.object(
+                crawler.async_reddit,
+                "subreddit",
+                AsyncMock(return_value=subreddit),
+            ),
+            patch.object(
+                RedditCrawler, "_submission_to_post_async", side_effect=fake_convert
+            ),
+        ):
+            posts = asyncio.run(
+                crawler.get_coding_discussions_async(
+                    ["vibecoding"], limit_per_subreddit=3
+                )
+            )
+
+        self.assertEqual(posts, ["a", "c", "d"])
+
+    def test_fetch_subreddit_skips_failed_submission(self):
+        """Test that one failing submission does not drop its subreddit."""
+        crawler = self.crawler
+
+        async def hot(limit):
+            for submission_id in ["a", "b", "c"]:
+                yield Mock(id=submission_id, title="Claude Code", selftext="")
+
+        subreddit = Mock()
+        subreddit.hot = hot
+
+        async def fake_convert(submission, include_comments):
+            if submission.id == "b":
+                raise RuntimeError("boom")
+            return submission.id
+
+        with (
+            patch.object(
+                crawler.async_reddit,
+                "subreddit",
+                AsyncMock(return_value=subreddit),
+            ),
+            patch.object(
+                RedditCrawler, "_submission_to_post_async", side_effect=fake_convert
+            ),
+        ):
+            posts = asyncio.run(crawler.get_coding_discussions_async(["cursor"]))
+
+        self.assertEqual(posts, ["a", "c"])
+
+    def test_get_coding_discussions_sync_repeated(self):
+        """Test that the sync wrapper works for repeated calls on one crawler."""
+        crawler = self.crawler
+
+        async def fake_fetch(subreddit_name, *args):
+            return [subreddit_name]
+
+        with (
+            patch.object(
+                RedditCrawler, "_fetch_subreddit_async", side_effect=fake_fetch
+            ),
+            patch.object(crawler.async_reddit, "close", AsyncMock()) as close,
+        ):
+            first = crawler.get_coding_discussions(["cursor"])
+            second = crawler.get_coding_discussions(["codex"])
+
+        self.assertEqual(first, ["cursor"])
+        self.assertEqual(second, ["codex"])
+        # The session is closed inside each call's loop, before it ends
+        self.assertEqual(close.await_count, 2)
+
+    def test_search_subreddit_async(self):
+        """Test searching a subreddit converts every matching submission."""
+        crawler = self.crawler
+
+        async def search(query, limit):
+            for submission_id in ["x", "y", "z"][:limit]:
+                yield Mock(id=submission_id)
+
+        subreddit = Mock()
+        subreddit.search = search
+
+        async def fake_convert(submission, include_comments):
+            return submission.id
+
+        with (
+            patch.object(
+                crawler.async_reddit,
+                "subreddit",
+                AsyncMock(return_value=subreddit),
+            ),
+            patch.object(
+                RedditCrawler, "_submission_to_post_async", side_effect=fake_convert
+            ),
+        ):
+            posts = asyncio.run(
+                crawler.search_subreddit_async("cursor", "rules", limit=2)
+            )
+
+        self.assertEqual(posts, ["x", "y"])
+
+    def test_search_subreddit_async_bounds_concurrency(self):
+        """Test that search conversions stay under the concurrency cap."""
+        crawler = self.crawler
+
+        async def search(query, limit):
+            for submission_id in range(limit):
+                yield Mock(id=submission_id)
+
+        subreddit = Mock()
+        subreddit.search = search
+        active = peak = 0
+
+        async def fake_convert(submission, include_comments):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return submission.id
+
+        with (
+            patch.object(
+                crawler.async_reddit,
+                "subreddit",
+                AsyncMock(return_value=subreddit),
+            ),
+            patch.object(
+                RedditCrawler, "_submission_to_post_async", side_effect=fake_convert
+            ),
+        ):
+            posts = asyncio.run(
+                crawler.search_subreddit_async(
+                    "cursor", "rules", limit=10, max_concurrent=3
+                )
+            )
+
+        self.assertEqual(posts, list(range(10)))
+        self.assertEqual(peak, 3)
+
+    def test_get_coding_discussions_async_skips_failed_subreddit(self):
+        """Test that one failing subreddit does not drop the others."""
+        crawler = self.crawler
+        post = RedditPost(
+            id="test123",
+            title="Test Post",
+            body="",
+            author="test_user",
+            score=1,
+            num_comments=0,
+            created_utc=CREATED_UTC,
+            url="https://reddit.com/test",
+            subreddit="cursor",
+            permalink="https://reddit.com/r/cursor/test123",
+            comments=[],
+        )
+
+        async def fake_fetch(subreddit_name, *args):
+            if subreddit_name == "broken":
+                raise RuntimeError("boom")
+            return [post]
+
+        with patch.object(
+            RedditCrawler, "_fetch_subreddit_async", side_effect=fake_fetch
+        ):
+            posts = asyncio.run(
+                crawler.get_coding_discussions_async(["cursor", "broken", "codex"])
+            )
+
+        self.assertEqual(posts, [post, post])
+
+    @live_test
     @unittest.skipIf(
         not all([os.getenv("REDDIT_CLIENT_ID"), os.getenv("REDDIT_CLIENT_SECRET")]),
         "Reddit API credentials not available",
@@ -110,7 +331,7 @@ class TestRedditPost(unittest.TestCase):
             author="test_user",
             score=42,
             num_comments=5,
-            created_utc=datetime.now(),
+            created_utc=CREATED_UTC,
             url="https://reddit.com/test",
             subreddit="test",
             permalink="https://reddit.com/r/test/test123",
@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """Integration tests for the complete Snooze pipeline with storage."""
 
+import asyncio
 import os
 import tempfile
+import time
 import unittest
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from unittest.mock import patch
 
 import dotenv
+from helpers import CREATED_UTC, live_test
 
 from snooze.crawler import RedditCrawler, RedditPost
 from snooze.storage import DataStorage
-from snooze.summarizer import LLMSummarizer
+from snooze.summarizer import DiscussionSummary, LLMSummarizer, PostSummary
+from snooze.visualizer import SnoozeVisualizer
 
 dotenv.load_dotenv()
 
@@ -18,14 +24,11 @@ dotenv.load_dotenv()
 class TestIntegration(unittest.TestCase):
     """Integration tests for the complete pipeline."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Use temporary directory for storage
-        self.temp_dir = tempfile.mkdtemp()
-        self.storage = DataStorage(self.temp_dir)
-
-        # Mock data
-        self.mock_posts = [
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test in the class."""
+        # Mock data, read-only so it is built once for the whole class
+        cls.mock_posts = [
             RedditPost(
                 id="test1",
                 title="GitHub Copilot vs Cursor comparison",
@@ -33,7 +36,7 @@ class TestIntegration(unittest.TestCase):
                 author="dev_user1",
                 score=45,
                 num_comments=12,
-                created_utc=datetime.now(),
+                created_utc=CREATED_UTC,
                 url="https://reddit.com/r/ChatGPTCoding/test1",
                 subreddit="ChatGPTCoding",
                 permalink="https://reddit.com/r/ChatGPTCoding/comments/test1/",
@@ -46,7 +49,7 @@ class TestIntegration(unittest.TestCase):
                 author="ai_enthusiast",
                 score=38,
                 num_comments=8,
-                created_utc=datetime.now(),
+                created_utc=CREATED_UTC,
                 url="https://reddit.com/r/ClaudeCode/test2",
                 subreddit="ClaudeCode",
                 permalink="https://reddit.com/r/ClaudeCode/comments/test2/",
@@ -54,11 +57,14 @@ class TestIntegration(unittest.TestCase):
             ),
         ]
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    def setUp(self):
+        """Set up test fixtures."""
+        # Use temporary directory for storage, closing the SQLite index before
+        # the directory is removed
+        temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(temp_dir.cleanup)
+        self.storage = DataStorage(temp_dir.name)
+        self.addCleanup(self.storage.close)
 
     def test_storage_posts_roundtrip(self):
         """Test saving and loading posts."""
@@ -106,6 +112,12 @@ class TestIntegration(unittest.TestCase):
         loaded = self.storage.load_posts(cache_key, max_age_hours=0)
         self.assertIsNone(loaded)
 
+        # Summaries follow the same expiration rules
+        self.assertFalse(self.storage.has_summaries(cache_key))
+        self.storage.save_summaries([], cache_key)
+        self.assertTrue(self.storage.has_summaries(cache_key))
+        self.assertFalse(self.storage.has_summaries(cache_key, max_age_hours=0))
+
     def test_cache_stats(self):
         """Test cache statistics."""
         # Initially empty
@@ -137,6 +149,130 @@ class TestIntegration(unittest.TestCase):
         stats = self.storage.get_cache_stats()
         self.assertEqual(stats["posts"]["file_count"], 0)
 
+    def test_post_summary_cache(self):
+        """Test post-level summary caching and lookup of uncached posts."""
+        summary = PostSummary(
+            original_post_id="test1",
+            title="GitHub Copilot vs Cursor comparison",
+            key_points=["Point 1"],
+            sentiment="positive",
+            topics=["coding"],
+            summary="Test summary content",
+            engagement_score=8,
+            url="https://reddit.com/r/ChatGPTCoding/comments/test1/",
+            subreddit="ChatGPTCoding",
+            created_utc=CREATED_UTC,
+        )
+        self.storage.save_post_summary(summary)
+
+        loaded = self.storage.load_post_summary("test1")
+        self.assertEqual(loaded, summary)
+        self.assertIs(self.storage.load_post_summary("test1"), loaded)
+        self.assertIsNone(self.storage.load_post_summary("test2"))
+
+        # Re-saving a summary must not serve the previously parsed copy, even
+        # when both saves land on the same clock tick
+        summary = replace(summary, summary="Updated summary content")
+        with patch("snooze.storage.time.time", return_value=time.time()):
+            self.storage.save_post_summary(summary)
+            self.storage.load_post_summary("test1")
+            summary = replace(summary, summary="Same tick summary content")
+            self.storage.save_post_summary(summary)
+            self.assertEqual(
+                self.storage.load_post_summary("test1").summary,
+                "Same tick summary content",
+            )
+
+        cached = self.storage.load_summaries_with_post_cache(self.mock_posts)
+        self.assertEqual(cached, [summary])
+
+        needing_analysis = self.storage.get_posts_needing_analysis(self.mock_posts)
+        self.assertEqual([post.id for post in needing_analysis], ["test2"])
+
+        cached, needing_analysis = self.storage.partition_by_cache(self.mock_posts)
+        self.assertEqual(cached, [summary])
+        self.assertEqual([post.id for post in needing_analysis], ["test2"])
+
+        self.assertEqual(
+            self.storage.get_cache_stats()["post_summaries"]["file_count"], 1
+        )
+        self.assertEqual(self.storage.clear_cache(category="post_summaries"), 1)
+        self.assertIsNone(self.storage.load_post_summary("test1"))
+
+    def test_save_post_summaries_bulk(self):
+        """Test saving several post summaries at once."""
+        summaries = [
+            PostSummary(
+                original_post_id=post.id,
+                title=post.title,
+                key_points=[],
+                sentiment="neutral",
+                topics=[],
+                summary="",
+                engagement_score=5,
+                url=post.permalink,
+                subreddit=post.subreddit,
+                is_relevant=post.id == "test1",
+            )
+            for post in self.mock_posts
+        ]
+        self.storage.save_post_summaries(summaries)
+
+        cached = self.storage.load_summaries_with_post_cache(self.mock_posts)
+        self.assertEqual(cached, summaries)
+        self.assertEqual(self.storage.get_posts_needing_analysis(self.mock_posts), [])
+
+    def test_concurrent_saves_of_one_key(self):
+        """Test that concurrent saves of one key neither fail nor leave temp files."""
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda _: self.storage.save_posts(self.mock_posts, "posts"),
+                    range(16),
+                )
+            )
+
+        self.assertEqual(self.storage.load_posts("posts"), self.mock_posts)
+        self.assertEqual(os.listdir(self.storage.posts_dir), ["posts.json.zst"])
+
+    def test_posts_cache_compressed(self):
+        """Test that cached posts are compressed and still readable."""
+        self.storage.save_posts(self.mock_posts, "posts")
+
+        self.assertTrue(os.path.exists(self.storage.posts_dir / "posts.json.zst"))
+        self.assertEqual(self.storage.load_posts("posts"), self.mock_posts)
+        self.assertEqual(self.storage.list_cached_files()["posts"], ["posts"])
+
+    def test_discussion_round_trip(self):
+        """Test that cached discussions keep every post summary field."""
+        summary = PostSummary(
+            original_post_id="test1",
+            title="GitHub Copilot vs Cursor comparison",
+            key_points=["Point 1"],
+            sentiment="mixed",
+            topics=["coding"],
+            summary="Test summary content",
+            engagement_score=8,
+            url="https://reddit.com/r/ChatGPTCoding/comments/test1/",
+            subreddit="ChatGPTCoding",
+            score=45,
+            num_comments=12,
+            relevance_reason="Compares coding assistants",
+            created_utc=CREATED_UTC,
+        )
+        discussion = DiscussionSummary(
+            topic="AI coding assistants",
+            key_insights=["Insight"],
+            common_themes=["Theme"],
+            sentiment_overview="Mixed",
+            post_summaries=[summary],
+            total_engagement=57,
+        )
+
+        self.storage.save_discussion(discussion, "discussion")
+        self.assertEqual(self.storage.load_discussion("discussion"), discussion)
+
+    @live_test
     @unittest.skipIf(
         not all([os.getenv("REDDIT_CLIENT_ID"), os.getenv("REDDIT_CLIENT_SECRET")]),
         "Reddit API credentials not available",
@@ -162,6 +298,7 @@ class TestIntegration(unittest.TestCase):
             self.assertIsInstance(post.title, str)
             self.assertEqual(post.subreddit.lower(), "chatgptcoding")
 
+    @live_test
     @unittest.skipIf(
         not all(
             [
@@ -189,7 +326,9 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(cached_posts), 2)
 
         # Test summarization (this will hit the actual API)
-        summaries = summarizer.summarize_posts(cached_posts[:1])  # Just test one post
+        summaries = asyncio.run(
+            summarizer.summarize_posts_async(cached_posts[:1])
+        )  # Just test one post
 
         if summaries:  # API call might fail
             # Test caching summaries
@@ -203,7 +342,9 @@ class TestIntegration(unittest.TestCase):
             self.assertEqual(len(cached_summaries), len(summaries))
 
             # Test discussion summary
-            discussion = summarizer.create_discussion_summary(summaries)
+            discussion = asyncio.run(
+                summarizer._create_discussion_summary_async(summaries)
+            )
             if discussion:
                 # Test caching discussion
                 discussion_cache_key = self.storage.generate_discussion_cache_key(
@@ -217,15 +358,10 @@ class TestIntegration(unittest.TestCase):
 
     def test_visualization_data_flow(self):
         """Test data flow in the visualization component."""
-        from snooze.visualizer import SnoozeVisualizer
-
         # Create visualizer with our temp storage
         visualizer = SnoozeVisualizer()
         visualizer.storage = self.storage
 
-        # Test serialization methods
-        from snooze.summarizer import DiscussionSummary, PostSummary
-
         # Create mock summary
         mock_summary = PostSummary(
             original_post_id="test1",
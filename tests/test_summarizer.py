@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """Test script for the LLM summarizer component."""
 
+import asyncio
 import json
 import os
 import unittest
-from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import dotenv
+from helpers import CREATED_UTC, live_test
 
 from snooze.crawler import RedditPost
-from snooze.summarizer import DiscussionSummary, LLMSummarizer, PostSummary
+from snooze.summarizer import (
+    DiscussionSummary,
+    LLMSummarizer,
+    PostSummary,
+    _parse_json_response,
+)
 
 dotenv.load_dotenv()
 
@@ -18,16 +24,20 @@ dotenv.load_dotenv()
 class TestLLMSummarizer(unittest.TestCase):
     """Test cases for LLMSummarizer."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.api_key = os.getenv("AZURE_API_KEY", "test_key")
-        self.endpoint = os.getenv("AZURE_ENDPOINT", "https://test.openai.azure.com")
-        self.deployment = os.getenv("AZURE_DEPLOYMENT", "test_deployment")
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test in the class."""
+        cls.api_key = os.getenv("AZURE_API_KEY", "test_key")
+        cls.endpoint = os.getenv("AZURE_ENDPOINT", "https://test.openai.azure.com")
+        cls.deployment = os.getenv("AZURE_DEPLOYMENT", "test_deployment")
+        # Prompt and trend tests never touch the client or caches, so they
+        # share one instance; tests that mock API calls build their own
+        cls.summarizer = LLMSummarizer(cls.api_key, cls.endpoint, cls.deployment)
 
     def test_initialization(self):
         """Test summarizer initialization."""
-        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
-        self.assertIsNotNone(summarizer.client)
+        summarizer = self.summarizer
+        self.assertIsNotNone(summarizer.async_client)
         self.assertEqual(summarizer.deployment, self.deployment)
 
     def test_from_env(self):
@@ -38,14 +48,17 @@ class TestLLMSummarizer(unittest.TestCase):
                 "AZURE_API_KEY": "env_key",
                 "AZURE_ENDPOINT": "https://env.openai.azure.com",
                 "AZURE_DEPLOYMENT": "env_deployment",
+                "AZURE_POST_MAX_TOKENS": "4096",
             },
         ):
             summarizer = LLMSummarizer.from_env()
             self.assertEqual(summarizer.deployment, "env_deployment")
+            self.assertEqual(summarizer.post_max_tokens, 4096)
+            self.assertEqual(summarizer.discussion_max_tokens, 1024)
 
     def test_create_post_summary_prompt(self):
         """Test prompt creation for post summarization."""
-        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+        summarizer = self.summarizer
 
         post = RedditPost(
             id="test123",
@@ -54,7 +67,7 @@ class TestLLMSummarizer(unittest.TestCase):
             author="test_user",
             score=25,
             num_comments=10,
-            created_utc=datetime.now(),
+            created_utc=CREATED_UTC,
             url="https://reddit.com/test",
             subreddit="ChatGPTCoding",
             permalink="https://reddit.com/r/ChatGPTCoding/test123",
@@ -68,9 +81,75 @@ class TestLLMSummarizer(unittest.TestCase):
         self.assertIn("Copilot is better", prompt)
         self.assertIn("JSON", prompt)
 
+    def test_prompts_share_static_prefix(self):
+        """Test that post data follows the instructions so prompts share a prefix."""
+        summarizer = self.summarizer
+
+        post = self._create_test_post()
+        other = self._create_test_post()
+        other.title = "A different post"
+
+        prompt = summarizer._create_post_summary_prompt(post)
+        other_prompt = summarizer._create_post_summary_prompt(other)
+        schema_end = prompt.index('"engagement_score": 1-10')
+
+        self.assertEqual(prompt[:schema_end], other_prompt[:schema_end])
+        self.assertLess(schema_end, prompt.index(post.title))
+
+    def test_post_prompt_truncates_long_content(self):
+        """Test that long bodies and comments are cut to their token budgets."""
+        summarizer = self.summarizer
+
+        post = self._create_test_post()
+        post.body = "b" * 100000
+        post.comments = ["x" * 5000, "short comment"] + ["y" * 1200] * 8
+
+        prompt = summarizer._create_post_summary_prompt(post)
+        comments = summarizer._format_comments(post).split("\n")
+
+        body = summarizer._format_body(post)
+        self.assertLessEqual(len(body), 16000)
+        self.assertIn(" [...] ", body)
+        self.assertIn(body, prompt)
+        self.assertEqual(len(comments[0]), 1200)
+        self.assertEqual(comments[1], "short comment")
+        self.assertLessEqual(sum(len(c) for c in comments), 6000)
+
+    def test_post_prompt_compacts_text(self):
+        """Test that quotes, links and extra whitespace are stripped from prompts."""
+        summarizer = self.summarizer
+
+        post = self._create_test_post()
+        post.body = "See   https://example.com/docs\n\n\n> quoted text\nThanks"
+        post.comments = ["> earlier reply\nAgreed,  see https://x.io   too"]
+
+        self.assertEqual(summarizer._format_body(post), "See\nThanks")
+        self.assertEqual(summarizer._format_comments(post), "Agreed, see too")
+
+    def test_comments_skip_repeated_lines(self):
+        """Test that quoted and repeated comment lines are sent only once."""
+        summarizer = self.summarizer
+
+        post = self._create_test_post()
+        post.comments = [
+            "Cursor keeps losing context",
+            "> Cursor keeps losing context\nSame here, Claude Code is better",
+            "I am a bot. Please contact the moderators.",
+        ]
+        other = self._create_test_post()
+        other.comments = ["I am a bot. Please contact the moderators.", "Nice"]
+
+        comments = summarizer._format_comments(post)
+        self.assertEqual(comments.count("Cursor keeps losing context"), 1)
+        self.assertIn("Same here, Claude Code is better", comments)
+
+        prompt = summarizer._create_batch_prompt([post, other])
+        self.assertEqual(prompt.count("I am a bot"), 1)
+        self.assertIn("Nice", prompt)
+
     def test_create_discussion_summary_prompt(self):
         """Test prompt creation for discussion summarization."""
-        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+        summarizer = self.summarizer
 
         summaries = [
             PostSummary(
@@ -226,9 +305,334 @@ class TestLLMSummarizer(unittest.TestCase):
             self.assertIsInstance(results[0], PostSummary)
             mock_summarize.assert_called_once()
 
+    def test_summarize_near_duplicate_posts_once(self):
+        """Test that reposts of the same text reuse one LLM analysis."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "is_relevant": True,
+                "key_points": ["Point 1"],
+                "sentiment": "positive",
+                "topics": ["topic1"],
+                "summary": "Test summary",
+                "engagement_score": 8,
+            }
+        )
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+
+        post = self._create_test_post()
+        repost = self._create_test_post()
+        repost.id = "repost456"
+        repost.title = post.title.upper()
+        repost.subreddit = "cursor"
+
+        async def summarize_both():
+            semaphore = asyncio.Semaphore(1)
+            first = await summarizer._summarize_post_async(post, semaphore)
+            second = await summarizer._summarize_post_async(repost, semaphore)
+            return first, second
+
+        first, second = asyncio.run(summarize_both())
+
+        summarizer.async_client.chat.completions.create.assert_awaited_once()
+        self.assertEqual(first.summary, "Test summary")
+        self.assertEqual(second.summary, "Test summary")
+        self.assertEqual(second.original_post_id, "repost456")
+        self.assertEqual(second.subreddit, "cursor")
+
+    def test_summarize_similar_posts_from_semantic_cache(self):
+        """Test that a paraphrased post reuses the analysis of a similar one."""
+        summarizer = LLMSummarizer(
+            self.api_key,
+            self.endpoint,
+            self.deployment,
+            embedding_deployment="test_embeddings",
+        )
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {"is_relevant": True, "summary": "Test summary"}
+        )
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+        summarizer.async_client.embeddings.create = AsyncMock(
+            side_effect=[
+                Mock(data=[Mock(embedding=[1.0, 0.0])]),
+                Mock(data=[Mock(embedding=[0.96, 0.28])]),
+            ]
+        )
+
+        post = self._create_test_post()
+        paraphrase = self._create_test_post()
+        paraphrase.id = "para456"
+        paraphrase.title = "Claude Code compared with Cursor"
+
+        async def summarize_both():
+            # One loop for both runs, as in the visualizer
+            await summarizer.summarize_posts_async([post])
+            return await summarizer.summarize_posts_async([paraphrase])
+
+        summaries = asyncio.run(summarize_both())
+
+        summarizer.async_client.chat.completions.create.assert_awaited_once()
+        self.assertEqual(summaries[0].original_post_id, "para456")
+        self.assertEqual(summaries[0].summary, "Test summary")
+
+    def test_rate_limiter_rebuilt_per_event_loop(self):
+        """Test that each event loop gets its own rate limiter."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+
+        async def bound_limiter():
+            await summarizer._bind_client()
+            return summarizer.rate_limiter
+
+        first = asyncio.run(bound_limiter())
+        second = asyncio.run(bound_limiter())
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.max_rate, summarizer.rpm)
+
+    def test_bind_client_replaces_only_its_own_client(self):
+        """Test that a new loop closes and rebuilds the summarizer's client."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+
+        async def bound_client():
+            await summarizer._bind_client()
+            return summarizer.async_client
+
+        first = asyncio.run(bound_client())
+        with patch.object(first, "close", AsyncMock()) as close:
+            second = asyncio.run(bound_client())
+
+        self.assertIsNot(first, second)
+        close.assert_awaited_once()
+
+        # A client assigned by the caller is kept across loops
+        injected = Mock()
+        summarizer.async_client = injected
+        self.assertIs(asyncio.run(bound_client()), injected)
+
+    def test_summarize_posts_deduplicates_cross_posts(self):
+        """Test that cross-posts in one call are analyzed once and fanned out."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = json.dumps(
+            {
+                "is_relevant": True,
+                "key_points": ["Point 1"],
+                "sentiment": "positive",
+                "topics": ["topic1"],
+                "summary": "Test summary",
+                "engagement_score": 8,
+            }
+        )
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+
+        post = self._create_test_post()
+        crosspost = self._create_test_post()
+        crosspost.id = "cross456"
+        crosspost.subreddit = "cursor"
+        crosspost.score = 3
+
+        summaries = asyncio.run(summarizer.summarize_posts_async([post, crosspost]))
+
+        summarizer.async_client.chat.completions.create.assert_awaited_once()
+        self.assertEqual(
+            [s.original_post_id for s in summaries], ["test123", "cross456"]
+        )
+        self.assertEqual(summaries[1].summary, "Test summary")
+        self.assertEqual(summaries[1].subreddit, "cursor")
+        self.assertEqual(summaries[1].score, 3)
+
+    def test_link_posts_with_same_title_analyzed_separately(self):
+        """Test that bodiless posts sharing a generic title are not deduped."""
+        summarizer = self.summarizer
+
+        post = self._create_test_post()
+        post.body = ""
+        post.title = "Question"
+        other = self._create_test_post()
+        other.id = "other456"
+        other.body = ""
+        other.title = "Question"
+        other.url = "https://i.redd.it/other.png"
+
+        self.assertNotEqual(
+            summarizer._post_content_key(post), summarizer._post_content_key(other)
+        )
+
+    def test_truncated_completion_is_reported(self):
+        """Test that a completion cut off at the token cap logs a warning."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+
+        mock_response = Mock()
+        mock_response.choices = [Mock(finish_reason="length")]
+        mock_response.choices[0].message.content = ""
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            return_value=mock_response
+        )
+
+        with self.assertLogs("snooze.summarizer", level="WARNING") as logs:
+            result = asyncio.run(
+                summarizer._llm_json("system", "prompt", 512, "post test123")
+            )
+
+        self.assertIsNone(result)
+        self.assertIn("hit the 512 token cap", logs.output[0])
+
+    def test_summarize_posts_in_batches(self):
+        """Test that posts are analyzed together and missing ones retried."""
+        summarizer = LLMSummarizer(
+            self.api_key, self.endpoint, self.deployment, batch_size=3
+        )
+
+        posts = []
+        for post_id in ["a", "b", "c"]:
+            post = self._create_test_post()
+            post.id = post_id
+            post.title = f"Post {post_id}"
+            posts.append(post)
+
+        def response_for(content):
+            response = Mock()
+            response.choices = [Mock()]
+            response.choices[0].message.content = json.dumps(content)
+            return response
+
+        analysis = {"is_relevant": True, "summary": "Batch summary"}
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            side_effect=[
+                # The batch answer leaves out post "c"
+                response_for(
+                    {"posts": [{"id": "a", **analysis}, {"id": "b", **analysis}]}
+                ),
+                response_for({"is_relevant": True, "summary": "Single summary"}),
+            ]
+        )
+
+        batch_callback = AsyncMock()
+        summaries = asyncio.run(
+            summarizer.summarize_posts_async(posts, batch_callback=batch_callback)
+        )
+
+        self.assertEqual(summarizer.async_client.chat.completions.create.await_count, 2)
+        batch_callback.assert_awaited_once()
+        self.assertEqual(
+            [summary.original_post_id for summary in batch_callback.await_args.args[0]],
+            ["a", "b", "c"],
+        )
+        for call in summarizer.async_client.chat.completions.create.await_args_list:
+            self.assertEqual(call.kwargs["response_format"], {"type": "json_object"})
+        by_id = {summary.original_post_id: summary.summary for summary in summaries}
+        self.assertEqual(
+            by_id, {"a": "Batch summary", "b": "Batch summary", "c": "Single summary"}
+        )
+
+    def test_summarize_posts_stops_after_failure_budget(self):
+        """Test that an outage stops sending requests once too many posts fail."""
+        summarizer = LLMSummarizer(
+            self.api_key, self.endpoint, self.deployment, batch_size=1
+        )
+        summarizer.async_client = Mock()
+        summarizer.async_client.chat.completions.create = AsyncMock(
+            side_effect=Exception("500 Internal Server Error")
+        )
+
+        posts = []
+        for i in range(100):
+            post = self._create_test_post()
+            post.id = f"post{i}"
+            post.title = f"Post number {i}"
+            posts.append(post)
+
+        summaries = asyncio.run(summarizer.summarize_posts_async(posts))
+
+        self.assertEqual(summaries, [])
+        self.assertLess(summarizer.async_client.chat.completions.create.await_count, 20)
+
+    def test_collect_batch_job(self):
+        """Test that batch job results are mapped back to their posts."""
+        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+        post = self._create_test_post()
+
+        def output_line(custom_id, status_code, content):
+            return json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "response": {
+                        "status_code": status_code,
+                        "body": {"choices": [{"message": {"content": content}}]},
+                    },
+                }
+            )
+
+        output = Mock()
+        output.text = "\n".join(
+            [
+                output_line(
+                    "test123", 200, json.dumps({"is_relevant": True, "summary": "ok"})
+                ),
+                output_line("unknown", 200, json.dumps({"is_relevant": True})),
+                output_line("test123", 429, ""),
+            ]
+        )
+        summarizer.async_client = Mock()
+        summarizer.async_client.batches.retrieve = AsyncMock(
+            return_value=Mock(status="completed", output_file_id="file-out")
+        )
+        summarizer.async_client.files.content = AsyncMock(return_value=output)
+
+        status, summaries = asyncio.run(summarizer.collect_batch_job("batch-1", [post]))
+
+        self.assertEqual(status, "completed")
+        self.assertEqual(len(summaries), 1)
+        self.assertEqual(summaries[0].original_post_id, "test123")
+        self.assertEqual(summaries[0].summary, "ok")
+
+        summarizer.async_client.batches.retrieve = AsyncMock(
+            return_value=Mock(status="in_progress")
+        )
+        status, summaries = asyncio.run(summarizer.collect_batch_job("batch-1", [post]))
+        self.assertEqual(status, "in_progress")
+        self.assertIsNone(summaries)
+
+    def test_parse_json_response(self):
+        """Test parsing plain, wrapped and invalid JSON responses."""
+        self.assertEqual(_parse_json_response('{"a": 1}'), {"a": 1})
+        self.assertEqual(
+            _parse_json_response('Here it is:\n{"a": "}{", "b": [1, {}]}\nDone'),
+            {"a": "}{", "b": [1, {}]},
+        )
+        self.assertEqual(
+            _parse_json_response('Per rubric [1]: {"a": 1}'),
+            {"a": 1},
+        )
+        self.assertEqual(
+            _parse_json_response('Draft {"a": [1} final {"b": 2}'),
+            {"b": 2},
+        )
+        self.assertIsNone(_parse_json_response("Invalid JSON response"))
+        self.assertIsNone(_parse_json_response("Broken {not json} text"))
+
     def test_analyze_trends(self):
         """Test trend analysis across discussions."""
-        summarizer = LLMSummarizer(self.api_key, self.endpoint, self.deployment)
+        summarizer = self.summarizer
 
         discussions = [
             DiscussionSummary(
@@ -255,8 +659,11 @@ class TestLLMSummarizer(unittest.TestCase):
         self.assertIn("sentiment_distribution", trends)
         self.assertIn("total_discussions", trends)
         self.assertEqual(trends["total_discussions"], 2)
-        self.assertGreater(trends["average_engagement"], 0)
+        self.assertEqual(trends["total_posts"], 2)
+        self.assertEqual(trends["top_themes"][0], ("coding", 2))
+        self.assertEqual(trends["average_engagement"], 40)
 
+    @live_test
     @unittest.skipIf(
         not all(
             [
@@ -272,9 +679,10 @@ class TestLLMSummarizer(unittest.TestCase):
         summarizer = LLMSummarizer.from_env()
         post = self._create_test_post()
 
-        result = summarizer.summarize_post(post)
+        results = asyncio.run(summarizer.summarize_posts_async([post]))
 
-        if result:  # API call might fail for various reasons
+        if results:  # API call might fail for various reasons
+            result = results[0]
             self.assertIsInstance(result, PostSummary)
             self.assertEqual(result.original_post_id, "test123")
             self.assertIsInstance(result.sentiment, str)
@@ -290,7 +698,7 @@ class TestLLMSummarizer(unittest.TestCase):
             author="test_user",
             score=15,
             num_comments=5,
-            created_utc=datetime.now(),
+            created_utc=CREATED_UTC,
             url="https://reddit.com/test",
             subreddit="ChatGPTCoding",
             permalink="https://reddit.com/r/ChatGPTCoding/test123",
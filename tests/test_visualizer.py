@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """Test script for the web visualizer component."""
 
+import asyncio
 import json
+import os
+import socket
 import unittest
 from unittest.mock import Mock, patch
 
 import dotenv
+from helpers import CREATED_UTC
 
 from snooze.summarizer import DiscussionSummary, PostSummary
 from snooze.visualizer import SnoozeVisualizer
@@ -16,12 +20,15 @@ dotenv.load_dotenv()
 class TestSnoozeVisualizer(unittest.TestCase):
     """Test cases for SnoozeVisualizer."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.visualizer = SnoozeVisualizer()
-        self.app = self.visualizer.app
-        self.client = self.app.test_client()
-        self.app.config["TESTING"] = True
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test in the class."""
+        # Building the app registers every route and opens the cache, so one
+        # visualizer serves all tests; none of them change its configuration
+        cls.visualizer = SnoozeVisualizer()
+        cls.app = cls.visualizer.app
+        cls.client = cls.app.test_client()
+        cls.app.config["TESTING"] = True
 
     def test_initialization(self):
         """Test visualizer initialization."""
@@ -116,6 +123,39 @@ class TestSnoozeVisualizer(unittest.TestCase):
         self.assertFalse(data["success"])
         self.assertIn("error", data)
 
+    def test_run_coroutine_reuses_event_loop(self):
+        """Test that async work from separate requests shares one event loop."""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        first = self.visualizer._run_coroutine(current_loop())
+        second = self.visualizer._run_coroutine(current_loop())
+
+        self.assertIs(first, second)
+        self.assertTrue(first.is_running())
+
+    def test_run_scans_past_busy_port_and_reuses_it_on_reload(self):
+        """Test that a taken port is skipped and the reloader keeps the choice."""
+        with (
+            socket.socket(socket.AF_INET, socket.SOCK_STREAM) as busy,
+            patch.dict(os.environ),
+            patch.object(self.visualizer.socketio, "run") as run,
+        ):
+            os.environ.pop("WERKZEUG_RUN_MAIN", None)
+            os.environ.pop("SNOOZE_RESOLVED_PORT", None)
+            busy.bind(("127.0.0.1", 0))
+            busy_port = busy.getsockname()[1]
+
+            self.visualizer.run(port=busy_port, debug=False)
+            port = run.call_args.kwargs["port"]
+            self.assertGreater(port, busy_port)
+
+            # The reloader's child serves on the port the parent printed
+            os.environ["WERKZEUG_RUN_MAIN"] = "true"
+            self.visualizer.run(port=busy_port, debug=False)
+            self.assertEqual(run.call_args.kwargs["port"], port)
+
     def test_serialize_post_summary(self):
         """Test post summary serialization."""
         summary = self._create_mock_summary()
@@ -179,8 +219,6 @@ class TestSnoozeVisualizer(unittest.TestCase):
 
     def _create_mock_post(self):
         """Create a mock Reddit post for testing."""
-        from datetime import datetime
-
         from snooze.crawler import RedditPost
 
         return RedditPost(
@@ -190,7 +228,7 @@ class TestSnoozeVisualizer(unittest.TestCase):
             author="test_user",
             score=25,
             num_comments=8,
-            created_utc=datetime.now(),
+            created_utc=CREATED_UTC,
             url="https://reddit.com/test",
             subreddit="ChatGPTCoding",
             permalink="https://reddit.com/r/ChatGPTCoding/test123",